@@ -19,6 +19,8 @@ from configuration import (
     OBJECT_SIZE_GB,
     DEFAULT_OBJECT_KEY,
     DEFAULT_PLOTS_DIR,
+    PLOT_FORMAT,
+    PLOT_FORMATS,
     STEADY_STATE_HOURS,
 )
 
@@ -102,6 +104,12 @@ Examples:
                                     help='Path to the Parquet file containing benchmark data')
         visualize_parser.add_argument('--output-dir', type=str, default=DEFAULT_PLOTS_DIR,
                                     help=f'Output directory for generated plots (default: {DEFAULT_PLOTS_DIR})')
+        visualize_parser.add_argument('--format', choices=PLOT_FORMATS, default=PLOT_FORMAT,
+                                    help=f'Image format for plots (default: {PLOT_FORMAT})')
+        visualize_parser.add_argument('--jobs', type=int, default=1,
+                                    help='Workers used to build plots in parallel (default: 1)')
+        visualize_parser.add_argument('--processes', action='store_true',
+                                    help='Use worker processes instead of threads for --jobs')
 
         return parser
 
@@ -184,10 +192,11 @@ Examples:
 
             visualizer = BenchmarkVisualizer(
                 parquet_file=args.parquet_file,
-                output_dir=args.output_dir
+                output_dir=args.output_dir,
+                plot_format=args.format,
             )
 
-            visualizer.create_all_plots()
+            visualizer.create_all_plots(jobs=args.jobs, processes=args.processes)
 
             logger.info("✓ Visualization completed successfully")
             return 0
@@ -25,9 +25,11 @@ from configuration import (
     PIPELINE_DEPTH,
     INITIAL_WORKERS_PER_CORE,
     MAX_WORKERS_PER_CORE,
+    PIN_WORKER_PROCESSES,
     STEADY_STATE_HOURS,
     CONNECTION_POOL_SAFETY_FACTOR,
     PERSISTENCE_FLUSH_INTERVAL_SECONDS,
+    PERSISTENCE_FLUSH_BYTES_THRESHOLD,
     CONSOLIDATION_BATCH_SIZE,
 )
 from persistence.parquet import ParquetPersistence
@@ -131,10 +133,12 @@ class CapacityChecker:
                 'pipeline_depth': self.pipeline_depth,
                 'max_workers_per_core': self.max_workers_per_core,
                 'persistence_flush_interval_seconds': PERSISTENCE_FLUSH_INTERVAL_SECONDS,
+                'persistence_flush_bytes_threshold': PERSISTENCE_FLUSH_BYTES_THRESHOLD,
                 'connection_pool_size': int(
                     self.max_workers_per_core * self.pipeline_depth * CONNECTION_POOL_SAFETY_FACTOR
                 ),
                 'executor_threads_per_process': 2,  # Minimal threads for disk writes
+                'pin_worker_processes': PIN_WORKER_PROCESSES,
             }
 
             self.process_pool = ProcessPool(
@@ -259,11 +263,8 @@ class CapacityChecker:
             parquet_files = []
             if not self.process_pool:
                 logger.warning("No process pool; skipping consolidation.")
-            for file_info in (self.process_pool.parquet_files if self.process_pool else []):
-                if isinstance(file_info, dict):
-                    parquet_files.append(file_info["path"])
-                else:
-                    parquet_files.append(file_info)
+            else:
+                parquet_files = list(self.process_pool.collected_files)
 
             logger.info(f"Parquet files from processes: {len(parquet_files)}")
 
@@ -275,111 +276,61 @@ class CapacityChecker:
                 output_dir = self.persistence.output_dir
                 output_file = os.path.join(output_dir, f"capacity_check_{self.storage_type}_{timestamp}.parquet")
 
-                # Streaming consolidation to minimize memory usage
+                # Consolidate in Arrow: tables are concatenated without copying,
+                # and the rows are copied once, by the sort
                 try:
-                    import pandas as pd
-                    import shutil
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
 
-                    # Use streaming consolidation if we have many files
                     batch_size = CONSOLIDATION_BATCH_SIZE
+                    batch_tables = []
+                    files_read = []
+                    total_batches = (len(parquet_files) + batch_size - 1) // batch_size
 
-                    if len(parquet_files) <= batch_size:
-                        # Small number of files - use simple approach
-                        logger.info(f"Using direct consolidation (files <= {batch_size})")
-                        dfs = []
-                        files_read = []
+                    # Read in batches, each combined into one chunk per column, so
+                    # the merged table has a few large chunks instead of one per file
+                    for batch_idx in range(0, len(parquet_files), batch_size):
+                        batch = parquet_files[batch_idx:batch_idx + batch_size]
+                        tables = []
 
-                        for filepath in parquet_files:
+                        for filepath in batch:
                             if os.path.exists(filepath):
-                                df = pd.read_parquet(filepath)
-                                dfs.append(df)
+                                tables.append(pq.read_table(filepath))
                                 files_read.append(filepath)
                             else:
                                 logger.warning(f"File not found: {filepath}")
 
-                        if dfs:
-                            merged_df = pd.concat(dfs, ignore_index=True)
-                        else:
-                            logger.error("No data frames to merge")
-                            merged_df = None
+                        if tables:
+                            batch_table = pa.concat_tables(tables).combine_chunks()
+                            batch_tables.append(batch_table)
+                            logger.info(
+                                f"Read batch {len(batch_tables)}/{total_batches} "
+                                f"({len(tables)} files, {batch_table.num_rows:,} records)"
+                            )
+                        del tables
+
+                    if batch_tables:
+                        merged_table = pa.concat_tables(batch_tables)
+                        del batch_tables
                     else:
-                        # Large number of files - use streaming consolidation
-                        logger.info(f"Using streaming consolidation (batch size: {batch_size} files)")
-
-                        # Create temporary directory for intermediate batch files
-                        temp_dir = os.path.join(output_dir, f"temp_consolidation_{timestamp}")
-                        os.makedirs(temp_dir, exist_ok=True)
-
-                        try:
-                            temp_batch_files = []
-                            files_read = []
-                            total_batches = (len(parquet_files) + batch_size - 1) // batch_size
-
-                            # Process files in batches
-                            for batch_idx in range(0, len(parquet_files), batch_size):
-                                batch = parquet_files[batch_idx:batch_idx + batch_size]
-                                batch_dfs = []
-
-                                for filepath in batch:
-                                    if os.path.exists(filepath):
-                                        df = pd.read_parquet(filepath)
-                                        batch_dfs.append(df)
-                                        files_read.append(filepath)
-                                    else:
-                                        logger.warning(f"File not found: {filepath}")
-
-                                if batch_dfs:
-                                    # Concatenate this batch
-                                    batch_merged = pd.concat(batch_dfs, ignore_index=True)
-
-                                    # Write intermediate batch file
-                                    batch_file = os.path.join(temp_dir, f"batch_{batch_idx // batch_size:04d}.parquet")
-                                    batch_merged.to_parquet(batch_file, index=False)
-                                    temp_batch_files.append(batch_file)
-
-                                    current_batch = (batch_idx // batch_size) + 1
-                                    logger.info(
-                                        f"Processed batch {current_batch}/{total_batches} "
-                                        f"({len(batch_dfs)} files, {len(batch_merged):,} records)"
-                                    )
-
-                                    # Free memory
-                                    del batch_dfs, batch_merged
-
-                            # Final merge of batch files (much fewer files)
-                            if temp_batch_files:
-                                logger.info(f"Final merge of {len(temp_batch_files)} batch files...")
-                                final_dfs = [pd.read_parquet(f) for f in temp_batch_files]
-                                merged_df = pd.concat(final_dfs, ignore_index=True)
-                                del final_dfs
-                            else:
-                                logger.error("No batch files created")
-                                merged_df = None
-
-                        finally:
-                            # Clean up temporary directory
-                            if os.path.exists(temp_dir):
-                                try:
-                                    shutil.rmtree(temp_dir)
-                                    logger.info(f"Cleaned up temporary directory: {temp_dir}")
-                                except Exception as e:
-                                    logger.warning(f"Failed to remove temp directory {temp_dir}: {e}")
+                        logger.error("No tables to merge")
+                        merged_table = None
 
                     # Sort and save final consolidated file
-                    if merged_df is not None:
+                    if merged_table is not None:
                         # Sort by timestamp for chronological order
-                        if 'start_ts' in merged_df.columns:
+                        if 'start_ts' in merged_table.column_names:
                             logger.info("Sorting records by start_ts...")
-                            merged_df = merged_df.sort_values('start_ts')
+                            merged_table = merged_table.sort_by('start_ts')
 
                         # Save consolidated file
                         logger.info(f"Writing consolidated file: {output_file}")
-                        merged_df.to_parquet(output_file, index=False, compression='snappy')
+                        pq.write_table(merged_table, output_file, compression='snappy')
                         self.persistence.output_file = output_file
 
                         logger.info(f"✓ Consolidated benchmark data saved to: {output_file}")
-                        logger.info(f"✓ Total records: {len(merged_df):,}")
-                        logger.info(f"✓ Phases: {sorted(merged_df['phase_id'].unique())}")
+                        logger.info(f"✓ Total records: {merged_table.num_rows:,}")
+                        logger.info(f"✓ Phases: {sorted(merged_table['phase_id'].unique().to_pylist())}")
 
                         # Delete individual parquet files to save space and reduce clutter
                         logger.info(f"Cleaning up {len(files_read)} individual parquet files...")
@@ -86,7 +86,8 @@ class Uploader:
                 # Upload main test object using streaming
                 logger.info(f"Uploading {object_key} ({size_gb} GB) using streaming")
 
-                start_time = time.time()
+                # Duration only: monotonic, unaffected by wall-clock adjustments
+                start_time = time.monotonic()
 
                 # Use streaming upload with the generator
                 success = await self.storage_system.upload_object_streaming(
@@ -95,7 +96,7 @@ class Uploader:
                     size_gb * BYTES_PER_GB,  # Total size in bytes
                 )
 
-                upload_time = time.time() - start_time
+                upload_time = time.monotonic() - start_time
 
                 if success:
                     logger.info(
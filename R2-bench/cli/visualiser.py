@@ -6,37 +6,104 @@ benchmark results stored in Parquet format.
 """
 
 import pandas as pd
+import pyarrow.parquet as pq
+from pyarrow import feather
 import os
 import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Import modular plot classes
 from visualizations.throughput_plots import ThroughputPlotter
 from visualizations.latency_plots import LatencyPlotter
 from visualizations.dashboard import DashboardPlotter
-from common.metrics_utils import ensure_retry_count_column
+from common.metrics_utils import ensure_retry_count_column, successful_request_mask
 
 logger = logging.getLogger(__name__)
 
+# Plot/table builders run by create_all_plots, in output order
+ALL_PLOT_METHODS = [
+    'create_throughput_timeline',
+    'create_per_second_throughput_timeline',
+    'create_throughput_vs_concurrency',
+    'create_throughput_stats_table',
+    'create_latency_histogram',
+    'create_latency_boxplot',
+    'create_latency_scatter',
+    'create_latency_over_time',
+    'create_violin_plot',
+    'create_latency_stats_table',
+    'create_error_analysis',
+    'create_performance_dashboard',
+    'create_summary_report',
+]
+
+# Columns any plot or table reads; everything else in the Parquet file is skipped
+PLOT_COLUMNS = [
+    'start_ts', 'end_ts', 'bytes', 'latency_ms', 'rtt_ms',
+    'http_status', 'concurrency', 'phase_id', 'retry_count',
+]
+
+# Narrower dtypes applied at load. bytes stays int64 (ranges can exceed
+# 4 GiB) and latency/RTT stay float64 so reported percentiles are unchanged.
+# start_ts/end_ts stay float64 epoch seconds: float32 resolves only ~2 minutes
+# at epoch scale, and the prorating kernels already work on shifted float64.
+NARROW_DTYPES = {
+    'http_status': 'int16',
+    'concurrency': 'int32',
+    'retry_count': 'int16',
+}
+
+# Builders that still produce output when no request succeeded
+FAILURE_TOLERANT_PLOT_METHODS = {'create_error_analysis', 'create_summary_report'}
+
+# Per-process visualizer used by create_all_plots(jobs > 1)
+_worker_visualizer = None
+
+
+def _init_plot_worker(snapshot_file: str, parquet_file: str, output_dir: str, plot_format: str):
+    """Build the worker's visualizer from the memory-mapped Arrow snapshot."""
+    global _worker_visualizer
+    data = feather.read_table(snapshot_file, memory_map=True).to_pandas()
+    _worker_visualizer = BenchmarkVisualizer(parquet_file, output_dir, data=data, plot_format=plot_format)
+
+
+def _run_plot_method(method_name: str):
+    """Run one create_* method on the worker's visualizer."""
+    return getattr(_worker_visualizer, method_name)()
+
 
 class BenchmarkVisualizer:
     """Simple visualizer for benchmark results using modular plot classes."""
     
-    def __init__(self, parquet_file: str, output_dir: str = "plots"):
+    def __init__(self, parquet_file: str, output_dir: str = "plots", data: pd.DataFrame = None,
+                 plot_format: str = None):
         self.parquet_file = parquet_file
         self.output_dir = output_dir
-        self.data = None
+        self.plot_format = plot_format
+        self.data = data
         
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
-        # Load data
-        self._load_data()
+        # Load data (unless an already loaded frame was handed in)
+        if self.data is None:
+            self._load_data()
         
         # Initialize modular plotters
         if self.data is not None:
-            self.throughput_plotter = ThroughputPlotter(self.data, self.output_dir, self.parquet_file)
-            self.latency_plotter = LatencyPlotter(self.data, self.output_dir, self.parquet_file)
-            self.dashboard_plotter = DashboardPlotter(self.data, self.output_dir, self.parquet_file)
+            # One derived-data cache for all plotters: they share the same
+            # frame, so filtered rows, arrays and phase boundaries are built once
+            plot_cache = {}
+            self.throughput_plotter = ThroughputPlotter(
+                self.data, self.output_dir, self.parquet_file, self.plot_format, cache=plot_cache
+            )
+            self.latency_plotter = LatencyPlotter(
+                self.data, self.output_dir, self.parquet_file, self.plot_format, cache=plot_cache
+            )
+            self.dashboard_plotter = DashboardPlotter(
+                self.data, self.output_dir, self.parquet_file, self.plot_format, cache=plot_cache
+            )
         else:
             self.throughput_plotter = None
             self.latency_plotter = None
@@ -47,8 +114,35 @@ class BenchmarkVisualizer:
     def _load_data(self):
         """Load benchmark data from Parquet file."""
         try:
-            self.data = pd.read_parquet(self.parquet_file)
+            # Project to the plotted columns so the rest are never read or decoded
+            schema_names = set(pq.read_schema(self.parquet_file).names)
+            columns = [c for c in PLOT_COLUMNS if c in schema_names]
+            table = pq.read_table(self.parquet_file, columns=columns, use_threads=True)
+            # One block per column (no consolidation copy), releasing each Arrow
+            # column as soon as it is converted so peak memory stays near 1x
+            self.data = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
             self.data = ensure_retry_count_column(self.data)
+            # Rows merged from files without retry_count carry NaN, which every
+            # reader already treats as 0
+            self.data['retry_count'] = self.data['retry_count'].fillna(0)
+            # Sort by start once; the window sweeps and time-ordered plots then
+            # see presorted start times
+            if 'start_ts' in self.data.columns:
+                self.data = self.data.sort_values('start_ts', kind='stable', ignore_index=True)
+            # Narrow integer columns (status codes and concurrency levels are
+            # small) so every column scan moves fewer bytes
+            for column, dtype in NARROW_DTYPES.items():
+                if column in self.data.columns:
+                    self.data[column] = self.data[column].astype(dtype)
+            # Few distinct phases: category codes make the per-phase masks
+            # integer comparisons instead of string comparisons. Categories
+            # follow first appearance (chronological after the sort), not the
+            # sorted or per-file dictionary order, so the category order
+            # matches the phase order the plots color and label by
+            if 'phase_id' in self.data.columns:
+                phase_ids = self.data['phase_id'].astype(object)
+                self.data['phase_id'] = pd.Categorical(phase_ids, categories=phase_ids.dropna().unique())
             logger.info(f"Loaded {len(self.data)} records from {self.parquet_file}")
         except Exception as e:
             logger.error(f"Failed to load data: {e}")
@@ -148,34 +242,90 @@ class BenchmarkVisualizer:
             return None
         return self.dashboard_plotter.create_performance_dashboard()
     
-    def create_all_plots(self):
-        """Create all available plots."""
-        plots = []
-        
-        # Throughput plots
-        if self.throughput_plotter is not None:
-            plots.append(self.create_throughput_timeline())
-            plots.append(self.create_per_second_throughput_timeline())
-            plots.append(self.create_throughput_vs_concurrency())
-            plots.append(self.create_throughput_stats_table())
-        
-        # Latency plots
-        if self.latency_plotter is not None:
-            plots.append(self.create_latency_histogram())
-            plots.append(self.create_latency_boxplot())
-            plots.append(self.create_latency_scatter())
-            plots.append(self.create_latency_over_time())
-            plots.append(self.create_violin_plot())
-            plots.append(self.create_latency_stats_table())
-            plots.append(self.create_error_analysis())
-        
-        # Dashboard and summary
-        if self.dashboard_plotter is not None:
-            plots.append(self.create_performance_dashboard())
-            plots.append(self.create_summary_report())
+    def create_all_plots(self, jobs: int = 1, processes: bool = False):
+        """Create all available plots.
+
+        Args:
+            jobs: Number of parallel workers. Threads by default: every plot
+                draws on its own Figure (no pyplot state) and Agg rendering and
+                image encoding release the GIL.
+            processes: Use worker processes instead of threads. The plots are
+                then built from an uncompressed Arrow snapshot of the data that
+                every worker memory-maps instead of unpickling the frame.
+        """
+        plot_methods = self._preflight_plot_methods()
+        if not plot_methods:
+            return []
+
+        jobs = min(jobs or 1, len(plot_methods), os.cpu_count() or 1)
+        if jobs > 1 and processes:
+            plots = self._create_plots_in_processes(plot_methods, jobs)
+        elif jobs > 1:
+            plots = self._create_plots_in_threads(plot_methods, jobs)
+        else:
+            plots = [getattr(self, name)() for name in plot_methods]
         
         # Filter out None values
         plots = [p for p in plots if p is not None]
         
         logger.info(f"Created {len(plots)} plots and tables in {self.output_dir}")
         return plots
+
+    def _preflight_plot_methods(self):
+        """Select the builders whose preconditions hold, checked once up front.
+
+        Builders that would only do their data prep and then bail out are
+        skipped here instead.
+        """
+        if self.data is None or len(self.data) == 0:
+            logger.warning("No data loaded; no plots created")
+            return []
+
+        ok_mask = successful_request_mask(self.data)
+        if not ok_mask.any():
+            logger.warning("No successful requests; only creating error analysis and summary")
+            return [name for name in ALL_PLOT_METHODS if name in FAILURE_TOLERANT_PLOT_METHODS]
+
+        plot_methods = list(ALL_PLOT_METHODS)
+        if self.data.loc[ok_mask, 'concurrency'].nunique() < 2:
+            logger.info("Single concurrency level; skipping violin plot")
+            plot_methods.remove('create_violin_plot')
+        return plot_methods
+
+    def _create_plots_in_threads(self, plot_methods, jobs: int):
+        """Fan the plot builders out over a thread pool sharing this visualizer."""
+        # The plotters share one cache, so warming it through one warms all
+        self.throughput_plotter.warm_caches()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(getattr(self, name)) for name in plot_methods]
+            plots = []
+            for name, future in zip(plot_methods, futures):
+                try:
+                    plots.append(future.result())
+                except Exception as e:
+                    logger.error(f"{name} failed in worker thread: {e}")
+                    plots.append(None)
+            return plots
+
+    def _create_plots_in_processes(self, plot_methods, jobs: int):
+        """Fan the plot builders out over a process pool."""
+        fd, snapshot_file = tempfile.mkstemp(prefix='visualiser_', suffix='.arrow')
+        os.close(fd)
+        try:
+            feather.write_feather(self.data, snapshot_file, compression='uncompressed')
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_plot_worker,
+                initargs=(snapshot_file, self.parquet_file, self.output_dir, self.plot_format),
+            ) as executor:
+                futures = [executor.submit(_run_plot_method, name) for name in plot_methods]
+                plots = []
+                for name, future in zip(plot_methods, futures):
+                    try:
+                        plots.append(future.result())
+                    except Exception as e:
+                        logger.error(f"{name} failed in worker process: {e}")
+                        plots.append(None)
+                return plots
+        finally:
+            os.remove(snapshot_file)
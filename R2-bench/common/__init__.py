@@ -2,6 +2,13 @@
 Common utilities for the R2 benchmark.
 """
 
-from .worker_pool import WorkerPool
-
 __all__ = ['WorkerPool']
+
+
+def __getattr__(name):
+    # Loaded on first access (PEP 562) so importing common.metrics_utils does
+    # not pull in the worker pool and its aiohttp/boto stack
+    if name == 'WorkerPool':
+        from .worker_pool import WorkerPool
+        return WorkerPool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
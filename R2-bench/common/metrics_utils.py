@@ -2,6 +2,7 @@
 Shared utilities for benchmark metrics calculations: throughput, latency, request rates, and prorating.
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from configuration import (
@@ -9,6 +10,7 @@ from configuration import (
     GIGABITS_PER_GB,
     BYTES_PER_GB,
     PER_SECOND_WINDOW_SIZE_SECONDS,
+    PRORATE_BLOCK_ROWS,
     HTTP_SUCCESS_STATUS,
     HTTP_PARTIAL_CONTENT_STATUS,
     HTTP_STATUS_NO_RESPONSE,
@@ -128,13 +130,24 @@ def calculate_latency_stats(data: pd.DataFrame, latency_col: str = 'latency_ms')
             'p99': 0.0
         }
     
-    latencies = successful_data[latency_col]
+    latencies = successful_data[latency_col].to_numpy(dtype=np.float64)
+    # One partition pass for all three percentiles (same linear interpolation
+    # as Series.quantile); NaNs are skipped as Series.mean/quantile do
+    latencies = latencies[~np.isnan(latencies)]
+    if len(latencies) == 0:
+        return {
+            'avg': np.nan,
+            'p50': np.nan,
+            'p95': np.nan,
+            'p99': np.nan
+        }
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
     
     return {
         'avg': latencies.mean(),
-        'p50': latencies.quantile(0.5),
-        'p95': latencies.quantile(0.95),
-        'p99': latencies.quantile(0.99)
+        'p50': p50,
+        'p95': p95,
+        'p99': p99
     }
 
 
@@ -184,21 +197,18 @@ def get_phase_boundaries(data: pd.DataFrame) -> dict:
     if len(data) == 0:
         return {}
     
-    phase_boundaries = {}
+    if 'start_ts' not in data.columns or 'end_ts' not in data.columns:
+        logger.warning("Data missing start_ts/end_ts, no phase boundaries")
+        return {}
     
-    for phase_id in data['phase_id'].unique():
-        # Get all requests that STARTED in this phase
-        phase_data = data[data['phase_id'] == phase_id]
-        if 'start_ts' not in phase_data.columns or 'end_ts' not in phase_data.columns:
-            logger.warning(f"Phase {phase_id} missing start_ts/end_ts, skipping")
-            continue
-        # Phase starts when first request in this phase starts
-        phase_start = phase_data['start_ts'].min()
-        # Phase ends when last request that started in this phase ends
-        phase_end = phase_data['end_ts'].max()
-        phase_boundaries[phase_id] = (phase_start, phase_end)
+    # One grouped pass over the rows (phases in order of first appearance):
+    # a phase starts when its first request starts and ends when the last
+    # request that started in it ends
+    grouped = data.groupby('phase_id', sort=False, observed=True)
+    phase_starts = grouped['start_ts'].min()
+    phase_ends = grouped['end_ts'].max()
     
-    return phase_boundaries
+    return dict(zip(phase_starts.index, zip(phase_starts.to_numpy(), phase_ends.to_numpy())))
 
 
 def calculate_phase_throughput_with_prorating(
@@ -220,7 +230,7 @@ def calculate_phase_throughput_with_prorating(
     Returns:
         Dictionary with phase statistics including prorated throughput
     """
-    successful_data = data[successful_request_mask(data)].copy()
+    successful_data = data[successful_request_mask(data)]
     
     if len(successful_data) == 0:
         return {
@@ -260,30 +270,20 @@ def calculate_phase_throughput_with_prorating(
             'phase_end': phase_end
         }
     
-    # Prorate all requests that overlap with this phase
-    total_bytes = 0.0
-    request_count = 0
-    
-    for _, request in successful_data.iterrows():
-        request_start = request['start_ts']
-        request_end = request['end_ts']
-        request_bytes = request['bytes']
-        
-        # Check if request overlaps with this phase
-        if request_start < phase_end and request_end > phase_start:
-            # Calculate overlap
-            overlap_start = max(request_start, phase_start)
-            overlap_end = min(request_end, phase_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
-            
-            # Calculate total request duration
-            request_duration = request_end - request_start
-            
-            if request_duration > 0:
-                # Prorate bytes based on overlap
-                prorated_bytes = (request_bytes * overlap_duration) / request_duration
-                total_bytes += prorated_bytes
-                request_count += 1
+    # Prorate all requests that overlap with this phase by the share of
+    # their duration spent inside it
+    request_start = successful_data['start_ts'].to_numpy(dtype=float)
+    request_end = successful_data['end_ts'].to_numpy(dtype=float)
+    request_bytes = successful_data['bytes'].to_numpy(dtype=float)
+    
+    overlap_duration = np.minimum(request_end, phase_end) - np.maximum(request_start, phase_start)
+    request_duration = request_end - request_start
+    overlapping = (overlap_duration > 0) & (request_duration > 0)
+    
+    total_bytes = float(np.sum(
+        request_bytes[overlapping] * overlap_duration[overlapping] / request_duration[overlapping]
+    ))
+    request_count = int(np.count_nonzero(overlapping))
     
     # Calculate throughput in gigabits per second (Gbps)
     throughput_gbps = calculate_throughput_gbps(total_bytes, phase_duration)
@@ -298,13 +298,169 @@ def calculate_phase_throughput_with_prorating(
     }
 
 
+def calculate_all_phase_throughputs(data: pd.DataFrame, phase_boundaries: dict = None) -> dict:
+    """
+    Prorated throughput of every phase in one pass over the request data.
+    
+    Same per-phase statistics as calculate_phase_throughput_with_prorating(),
+    but the start/end/bytes columns are read once and the (requests x phases)
+    overlaps are reduced together instead of re-scanning the data per phase.
+    Requests are processed in blocks of PRORATE_BLOCK_ROWS so the overlap
+    temporaries stay bounded on long runs.
+    
+    Args:
+        data: DataFrame with request data (must have start_ts, end_ts, bytes, phase_id)
+        phase_boundaries: Optional pre-computed phase boundaries dict
+    
+    Returns:
+        Dictionary mapping phase_id to its statistics dict, in phase_boundaries order
+    """
+    successful_data = data[successful_request_mask(data)]
+    if len(successful_data) == 0:
+        return {}
+    
+    if phase_boundaries is None:
+        phase_boundaries = get_phase_boundaries(data)
+    if not phase_boundaries:
+        return {}
+    
+    phase_ids = list(phase_boundaries.keys())
+    bounds = np.array(list(phase_boundaries.values()), dtype=float)
+    phase_starts, phase_ends = bounds[:, 0], bounds[:, 1]
+    
+    starts = successful_data['start_ts'].to_numpy(dtype=float)
+    ends = successful_data['end_ts'].to_numpy(dtype=float)
+    request_bytes = successful_data['bytes'].to_numpy(dtype=float)
+    
+    total_bytes = np.zeros(len(phase_ids))
+    request_counts = np.zeros(len(phase_ids), dtype=np.int64)
+    for block_start in range(0, len(starts), PRORATE_BLOCK_ROWS):
+        block = slice(block_start, block_start + PRORATE_BLOCK_ROWS)
+        request_start = starts[block, None]
+        request_end = ends[block, None]
+        overlap_duration = np.minimum(request_end, phase_ends) - np.maximum(request_start, phase_starts)
+        request_duration = request_end - request_start
+        overlapping = (overlap_duration > 0) & (request_duration > 0)
+        # Requests with zero duration never overlap, so the division is guarded
+        share = np.divide(overlap_duration, request_duration,
+                          out=np.zeros_like(overlap_duration), where=overlapping)
+        total_bytes += request_bytes[block] @ share
+        request_counts += np.count_nonzero(overlapping, axis=0)
+    
+    results = {}
+    for p, phase_id in enumerate(phase_ids):
+        phase_start, phase_end = phase_boundaries[phase_id]
+        phase_duration = phase_end - phase_start
+        if phase_duration <= 0:
+            results[phase_id] = {
+                'total_bytes': 0,
+                'duration_seconds': 0,
+                'throughput_gbps': 0,
+                'request_count': 0,
+                'phase_start': phase_start,
+                'phase_end': phase_end
+            }
+            continue
+        results[phase_id] = {
+            'total_bytes': float(total_bytes[p]),
+            'duration_seconds': phase_duration,
+            'throughput_gbps': calculate_throughput_gbps(float(total_bytes[p]), phase_duration),
+            'request_count': int(request_counts[p]),
+            'phase_start': phase_start,
+            'phase_end': phase_end
+        }
+    
+    return results
+
+
+def build_window_starts(start_time: float, end_time: float, window_size_seconds: float) -> np.ndarray:
+    """
+    Start times of consecutive fixed-size windows covering [start_time, end_time].
+    
+    Args:
+        start_time: First window start (seconds since epoch)
+        end_time: Last time that must fall into a window start range (inclusive)
+        window_size_seconds: Size of each window in seconds
+    
+    Returns:
+        Array of window start times: start_time + k * window_size_seconds <= end_time
+    """
+    if window_size_seconds <= 0 or end_time < start_time:
+        return np.array([], dtype=float)
+    window_count = int((end_time - start_time) // window_size_seconds) + 1
+    return start_time + window_size_seconds * np.arange(window_count, dtype=float)
+
+
+def build_overlap_index(starts, ends, request_bytes) -> dict:
+    """Sorted request events and prefix sums for repeated window queries.
+
+    Requests without a positive duration are dropped. Start and end times
+    are sorted once, each with prefix sums of the byte rates, so any set of
+    windows can then be prorated and counted with binary searches alone.
+    Times are shifted to the first start to keep the products small.
+
+    Args:
+        starts: Request start times (seconds since epoch)
+        ends: Request end times (seconds since epoch)
+        request_bytes: Bytes transferred by each request
+
+    Returns:
+        Dictionary with the origin and, for the 'start' and 'end' events,
+        sorted times plus rate and rate*time prefix sums
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    request_bytes = np.asarray(request_bytes, dtype=float)
+    timed = ends > starts
+    starts, ends, request_bytes = starts[timed], ends[timed], request_bytes[timed]
+    origin = starts.min() if len(starts) else 0.0
+    rates = request_bytes / (ends - starts)
+
+    index = {'origin': origin, 'request_count': len(starts)}
+    for name, event_times in (('start', starts - origin), ('end', ends - origin)):
+        if np.all(event_times[1:] >= event_times[:-1]):
+            # Already in order (data sorted by start_ts at load): skip the sort
+            sorted_times, sorted_rates = event_times, rates
+        else:
+            order = np.argsort(event_times, kind='stable')
+            sorted_times = event_times[order]
+            sorted_rates = rates[order]
+        index[name] = (
+            sorted_times,
+            np.concatenate(([0.0], np.cumsum(sorted_rates))),
+            np.concatenate(([0.0], np.cumsum(sorted_rates * sorted_times))),
+        )
+    return index
+
+
+def _cumulative_prorated_bytes(overlap_index, points):
+    """Bytes transferred up to each time point, prorating every request linearly.
+
+    At time t the total is sum(rate * (t - start)) over started requests
+    minus sum(rate * (t - end)) over finished ones, both read from the
+    prefix sums of the overlap index.
+    """
+    points = np.asarray(points, dtype=float)
+    total = np.zeros(len(points))
+    if overlap_index['request_count'] == 0:
+        return total
+    t = points - overlap_index['origin']
+    for name, sign in (('start', 1.0), ('end', -1.0)):
+        sorted_times, rate_prefix, weighted_prefix = overlap_index[name]
+        k = np.searchsorted(sorted_times, t, side='left')
+        total += sign * (t * rate_prefix[k] - weighted_prefix[k])
+    return total
+
+
 def prorate_bytes_to_time_windows(
     data: pd.DataFrame,
     window_start_times: list,
     window_size_seconds: float = None,
     start_col: str = 'start_ts',
     end_col: str = 'end_ts',
-    bytes_col: str = 'bytes'
+    bytes_col: str = 'bytes',
+    phase_boundaries: dict = None,
+    overlap_index: dict = None
 ) -> pd.DataFrame:
     """
     Prorate bytes from requests across time windows based on actual request duration.
@@ -320,6 +476,9 @@ def prorate_bytes_to_time_windows(
         start_col: Column name for request start time (default: 'start_ts')
         end_col: Column name for request end time (default: 'end_ts')
         bytes_col: Column name for bytes transferred (default: 'bytes')
+        phase_boundaries: Optional pre-computed phase boundaries dict of data
+        overlap_index: Optional build_overlap_index() result for the successful
+            requests of data, reused across calls with different windows
     
     Returns:
         DataFrame with columns: window_start, throughput_gbps, total_bytes, request_count, phase_id
@@ -331,7 +490,7 @@ def prorate_bytes_to_time_windows(
         return pd.DataFrame(columns=['window_start', 'throughput_gbps', 'total_bytes', 'request_count', 'phase_id'])
     
     # Filter to successful requests only
-    successful_data = data[successful_request_mask(data)].copy()
+    successful_data = data[successful_request_mask(data)]
     
     if len(successful_data) == 0:
         return pd.DataFrame(columns=['window_start', 'throughput_gbps', 'total_bytes', 'request_count', 'phase_id'])
@@ -344,71 +503,108 @@ def prorate_bytes_to_time_windows(
         return pd.DataFrame(columns=['window_start', 'throughput_gbps', 'total_bytes', 'request_count', 'phase_id'])
     
     # Get phase boundaries for determining which phase each window belongs to
-    phase_boundaries = get_phase_boundaries(data)
-    
-    results = []
-    
-    for window_start in window_start_times:
-        window_end = window_start + window_size_seconds
-        
-        # Find all requests that overlap with this window
-        overlapping = successful_data[
-            (successful_data[start_col] < window_end) & 
-            (successful_data[end_col] > window_start)
-        ]
-        
-        if len(overlapping) == 0:
-            continue
-        
-        total_bytes = 0.0
-        request_count = 0
-        
-        for _, request in overlapping.iterrows():
-            request_start = request[start_col]
-            request_end = request[end_col]
-            request_bytes = request[bytes_col]
-            
-            # Calculate overlap between request and window
-            overlap_start = max(request_start, window_start)
-            overlap_end = min(request_end, window_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
-            
-            # Calculate total request duration
-            request_duration = request_end - request_start
-            
-            if request_duration > 0:
-                # Prorate bytes based on overlap
-                prorated_bytes = (request_bytes * overlap_duration) / request_duration
-                total_bytes += prorated_bytes
-                request_count += 1
-        
-        # Calculate throughput in gigabits per second (Gbps) for this window
-        throughput_gbps = calculate_throughput_gbps(total_bytes, window_size_seconds)
-        
-        # Determine which phase this window belongs to based on phase boundaries
-        # Use the phase that contains the majority of this window
-        window_center = window_start + window_size_seconds / 2
-        phase_id = None
-        for pid, (p_start, p_end) in phase_boundaries.items():
-            if p_start <= window_center <= p_end:
-                phase_id = pid
-                break
-        
-        # Fallback: use the most common phase_id from overlapping requests
-        if phase_id is None and len(overlapping) > 0:
-            phase_id = overlapping['phase_id'].mode()[0] if len(overlapping['phase_id'].mode()) > 0 else overlapping['phase_id'].iloc[0]
-        
-        results.append({
-            'window_start': pd.to_datetime(window_start, unit='s'),
-            'window_start_ts': window_start,
-            'throughput_gbps': throughput_gbps,
-            'total_bytes': total_bytes,
-            'request_count': request_count,
-            'phase_id': phase_id
-        })
-    
-    if not results:
+    if phase_boundaries is None:
+        phase_boundaries = get_phase_boundaries(data)
+    
+    # Bytes and request counts for every window in one vectorized pass
+    window_starts = np.asarray(window_start_times, dtype=float)
+    window_ends = window_starts + window_size_seconds
+    if overlap_index is None:
+        overlap_index = build_overlap_index(
+            successful_data[start_col].to_numpy(dtype=float),
+            successful_data[end_col].to_numpy(dtype=float),
+            successful_data[bytes_col].to_numpy(dtype=float),
+        )
+    # One sweep evaluated at the window edges. Back-to-back windows (as from
+    # build_window_starts) share their inner edges, so W + 1 points suffice
+    contiguous = len(window_starts) > 1 and np.allclose(
+        window_starts[1:], window_ends[:-1], rtol=0, atol=1e-6 * window_size_seconds
+    )
+    if contiguous:
+        cumulative = _cumulative_prorated_bytes(overlap_index, np.append(window_starts, window_ends[-1]))
+        window_bytes = np.diff(cumulative)
+    else:
+        cumulative = _cumulative_prorated_bytes(
+            overlap_index, np.concatenate([window_starts, window_ends])
+        )
+        window_bytes = cumulative[len(window_starts):] - cumulative[:len(window_starts)]
+    # Requests overlapping [a, b): started before b minus those already ended by a
+    origin = overlap_index['origin']
+    window_counts = (
+        np.searchsorted(overlap_index['start'][0], window_ends - origin, side='left')
+        - np.searchsorted(overlap_index['end'][0], window_starts - origin, side='right')
+    )
+    
+    # Windows without any overlapping request are left out
+    keep = window_counts > 0
+    if not keep.any():
         return pd.DataFrame(columns=['window_start', 'throughput_gbps', 'total_bytes', 'request_count', 'phase_id'])
     
-    return pd.DataFrame(results)
+    kept_starts = window_starts[keep]
+    total_bytes = window_bytes[keep]
+    # Plain typed arrays for the phase lookup: sorted integer phase codes
+    # (sort=True so the smallest code is the label pandas' mode() would pick)
+    phase_codes, phases = pd.factorize(successful_data['phase_id'], sort=True)
+    request_arrays = (
+        successful_data[start_col].to_numpy(dtype=float),
+        successful_data[end_col].to_numpy(dtype=float),
+        phase_codes,
+    )
+    phase_ids = _window_phases(kept_starts, window_size_seconds, phase_boundaries, request_arrays, phases)
+    
+    return pd.DataFrame({
+        'window_start': pd.to_datetime(kept_starts, unit='s'),
+        'window_start_ts': kept_starts,
+        # Throughput in gigabits per second (Gbps) for each window
+        'throughput_gbps': calculate_throughput_gbps(total_bytes, window_size_seconds),
+        'total_bytes': total_bytes,
+        'request_count': window_counts[keep],
+        'phase_id': phase_ids,
+    })
+
+
+def _window_phases(window_starts, window_size_seconds, phase_boundaries, request_arrays, phases):
+    """Phase of every time window.
+
+    The first phase (in phase_boundaries order) whose boundaries contain the
+    window center; windows outside every phase fall back to _window_phase.
+    Phase boundaries overlap where requests straddle a step change, so the
+    first containing phase is picked from a (phases x windows) containment
+    mask rather than a searchsorted on the phase starts.
+    """
+    window_starts = np.asarray(window_starts, dtype=float)
+    phase_ids = np.empty(len(window_starts), dtype=object)
+    centers = window_starts + window_size_seconds / 2
+    if phase_boundaries:
+        bounds = np.array(list(phase_boundaries.values()), dtype=float)
+        labels = np.array(list(phase_boundaries.keys()), dtype=object)
+        contains = (bounds[:, :1] <= centers) & (centers <= bounds[:, 1:])
+        inside = contains.any(axis=0)
+        phase_ids[inside] = labels[contains.argmax(axis=0)[inside]]
+    else:
+        inside = np.zeros(len(window_starts), dtype=bool)
+    for i in np.flatnonzero(~inside):
+        phase_ids[i] = _window_phase(window_starts[i], window_size_seconds, request_arrays, phases)
+    return phase_ids.tolist()
+
+
+def _window_phase(window_start, window_size_seconds, request_arrays, phases):
+    """Phase of a window outside every phase boundary.
+
+    The most common phase_id among the requests overlapping the window (ties
+    go to the smallest phase_id, as with Series.mode()).
+
+    Args:
+        request_arrays: (start times, end times, phase codes) of the requests
+        phases: Phase labels indexed by the phase codes
+    """
+    starts, ends, phase_codes = request_arrays
+    overlapping = phase_codes[(starts < window_start + window_size_seconds) & (ends > window_start)]
+    # Codes of missing phase_ids (-1) cannot be counted
+    overlapping = overlapping[overlapping >= 0]
+    if len(overlapping) == 0:
+        return None
+    # Counting over the integer codes needs no sort; argmax takes the first
+    # (smallest) code on ties
+    return phases[np.bincount(overlapping).argmax()]
 
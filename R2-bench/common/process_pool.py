@@ -9,19 +9,126 @@ Architecture:
 """
 
 import asyncio
+import ctypes
 import multiprocessing as mp
 import logging
 import time
 import os
-import pandas as pd
+import struct
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from typing import Dict, Any, List, Optional
 
+from configuration import (
+    PIN_WORKER_PROCESSES,
+    HTTP_SUCCESS_STATUS,
+    HTTP_PARTIAL_CONTENT_STATUS,
+    PERSISTENCE_FLUSH_BYTES_THRESHOLD,
+    PERSISTENCE_RECORD_SIZE_ESTIMATE_BYTES,
+)
+from common.storage_factory import create_storage_system
+from common.worker_pool import WorkerPool
+from persistence.parquet import ParquetPersistence
+from common.metrics_utils import (
+    calculate_phase_throughput_with_prorating,
+)
+
 # Set up uvloop for performance
 import uvloop
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 logger = logging.getLogger(__name__)
 
+# Capacity (bytes) of the shared phase_id / object_key buffers, and of the
+# phase_id field of RESULT_MESSAGE
+SHARED_STRING_BYTES = 256
+
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerSettings:
+    """The instance_config values a worker process reads, shipped to it instead of the whole dict."""
+
+    max_workers_per_core: int = 0  # Connection pools are sized for this peak (0 = initial workers)
+    pipeline_depth: int = 3
+    flush_interval_seconds: float = 60.0
+    flush_bytes_threshold: int = PERSISTENCE_FLUSH_BYTES_THRESHOLD
+    pin_to_cpu: bool = PIN_WORKER_PROCESSES
+
+    @classmethod
+    def from_instance_config(cls, instance_config: Dict[str, Any]) -> "WorkerSettings":
+        return cls(
+            max_workers_per_core=int(instance_config.get('max_workers_per_core', 0)),
+            pipeline_depth=instance_config.get('pipeline_depth', 3),
+            flush_interval_seconds=instance_config.get('persistence_flush_interval_seconds', 60.0),
+            flush_bytes_threshold=instance_config.get('persistence_flush_bytes_threshold', PERSISTENCE_FLUSH_BYTES_THRESHOLD),
+            pin_to_cpu=instance_config.get('pin_worker_processes', PIN_WORKER_PROCESSES),
+        )
+
+
+class SharedState(ctypes.Structure):
+    """Shared state the main process publishes to every worker process, in one shared-memory block."""
+
+    _fields_ = [
+        ('workers_per_core', ctypes.c_int),
+        ('total_workers', ctypes.c_int),
+        ('total_http_requests', ctypes.c_int),  # Total HTTP requests for metrics
+        ('flush_acks', ctypes.c_int),  # Workers that finished the current end-of-phase flush
+        ('phase_id', ctypes.c_char * SHARED_STRING_BYTES),  # UTF-8, NUL-padded
+        ('object_key', ctypes.c_char * SHARED_STRING_BYTES),  # UTF-8, NUL-padded
+    ]
+
+
+# Parquet file notification sent by a worker process: process_id, record_count,
+# phase_id and file path as NUL-padded UTF-8. Fixed size, so no pickling happens
+# on either side and several notifications can go out as one concatenated send
+RESULT_PATH_BYTES = 1024
+RESULT_MESSAGE = struct.Struct(f'<II{SHARED_STRING_BYTES}s{RESULT_PATH_BYTES}s')
+
+# Modules imported once in the forkserver; worker processes are forked from it
+# with boto/aiohttp, pandas and pyarrow already loaded instead of importing them
+FORKSERVER_PRELOAD = [
+    'common.process_pool',
+    'common.storage_factory',
+    'common.worker_pool',
+    'persistence.parquet',
+    'pandas',
+    'pyarrow',
+    'aioboto3',
+    'uvloop',
+]
+
+# Longest get_step_stats waits for the drainer thread to pick up notifications
+# already sitting in the pipes, and how often it checks
+DRAIN_WAIT_SECONDS = 5.0
+DRAIN_POLL_SECONDS = 0.05
+
+# Longest execute_phase waits for every worker process to acknowledge the
+# end-of-phase flush, and how often it checks the acknowledgement count
+FLUSH_BARRIER_TIMEOUT_SECONDS = 30.0
+FLUSH_BARRIER_POLL_SECONDS = 0.1
+
+# Longest a worker process waits between shared-state checks when it misses a
+# phase_event pulse (changes are otherwise picked up as soon as they are signalled)
+PHASE_CHECK_INTERVAL_SECONDS = 2.0
+
+# Columns get_step_stats needs; the rest of each record is never decoded
+STEP_STATS_COLUMNS = [
+    'phase_id', 'start_ts', 'end_ts', 'bytes', 'http_status', 'concurrency', 'latency_ms',
+]
+
+# Columns the prorated throughput calculation reads
+THROUGHPUT_COLUMNS = ['phase_id', 'start_ts', 'end_ts', 'bytes']
+
+# Statuses counted as successful (as successful_request_mask)
+SUCCESS_STATUSES = pa.array([HTTP_SUCCESS_STATUS, HTTP_PARTIAL_CONTENT_STATUS])
+
 
 def _run_worker_process(
     process_id: int,
@@ -30,14 +137,11 @@ def _run_worker_process(
     workers_per_core: int,
     phase_id: str,
     duration_seconds: float,
-    instance_config: Dict[str, Any],
-    result_queue: mp.Queue,
+    settings: "WorkerSettings",
+    result_conn: Connection,
     stop_event: mp.Event,
-    shared_phase_id,
-    shared_object_key,
-    shared_workers_per_core,
-    shared_total_workers,
-    shared_total_http_requests,
+    phase_event: mp.Event,
+    shared_state,
 ):
     """Worker process function. Runs in separate process (one per core).
 
@@ -48,14 +152,11 @@ def _run_worker_process(
         workers_per_core: Initial number of async workers for this core
         phase_id: Phase identifier
         duration_seconds: How long to run (or inf for continuous)
-        instance_config: Instance configuration dict
-        result_queue: Queue for sending records to main process
+        settings: Worker settings taken from the instance configuration
+        result_conn: Send end of this process's pipe to the main process (parquet file notifications)
         stop_event: Event for coordinated shutdown
-        shared_phase_id: Shared value for phase transitions
-        shared_object_key: Shared value for object key
-        shared_workers_per_core: Shared value for workers per core (updated during ramp)
-        shared_total_workers: Shared value for total workers across all cores
-        shared_total_http_requests: Shared value for total HTTP requests (workers × cores × pipeline)
+        phase_event: Event pulsed by the main process whenever the shared state changes
+        shared_state: Synchronized SharedState (phase, object key, worker counts, flush acks)
     """
     # Suppress verbose logging in child processes
     logging.root.setLevel(logging.WARNING)
@@ -71,18 +172,52 @@ def _run_worker_process(
     process_logger = logging.getLogger(f"process_{process_id}")
     process_logger.setLevel(logging.INFO)
 
+    if settings.pin_to_cpu:
+        _pin_to_cpu(process_id, process_logger)
+
     # Initialize uvloop for this process
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
     # Run async worker
     return asyncio.run(_async_worker_process(
         process_id, storage_type, object_key, workers_per_core,
-        phase_id, duration_seconds, instance_config, result_queue, stop_event,
-        shared_phase_id, shared_object_key, shared_workers_per_core,
-        shared_total_workers, shared_total_http_requests
+        phase_id, duration_seconds, settings, result_conn, stop_event, phase_event,
+        shared_state
     ))
 
 
+def _drop_from_page_cache(paths: List[str]) -> None:
+    """Advise the kernel to evict files that were read once from the page cache."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"posix_fadvise failed for {path}: {e}")
+
+
+def _pin_to_cpu(process_id: int, process_logger: logging.Logger) -> None:
+    """Pin the calling process to one of the CPUs it may run on.
+
+    Keeps each worker's event loop and connection state in one core's caches
+    instead of letting the scheduler migrate it. Threads started later (the
+    Parquet writer, the executor waiting on phase_event) inherit the same CPU
+    and compete with the loop, and CPUs are chosen by process_id regardless
+    of other processes, hence opt-in (PIN_WORKER_PROCESSES). No-op where
+    unsupported.
+    """
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[process_id % len(cpus)]})
+    except (AttributeError, OSError) as e:
+        process_logger.debug(f"Process {process_id}: CPU pinning unavailable: {e}")
+
+
 async def _async_worker_process(
     process_id: int,
     storage_type: str,
@@ -90,172 +225,195 @@ async def _async_worker_process(
     workers_per_core: int,
     phase_id: str,
     duration_seconds: float,
-    instance_config: Dict[str, Any],
-    result_queue: mp.Queue,
+    settings: "WorkerSettings",
+    result_conn: Connection,
     stop_event: mp.Event,
-    shared_phase_id,
-    shared_object_key,
-    shared_workers_per_core,
-    shared_total_workers,
-    shared_total_http_requests,
+    phase_event: mp.Event,
+    shared_state,
 ):
     """Async worker process task."""
-    from common.storage_factory import create_storage_system
-    from common.worker_pool import WorkerPool
-    from persistence.parquet import ParquetPersistence
-
     process_logger = logging.getLogger(f"process_{process_id}")
 
     try:
         # Initialize storage and worker pool
         # Size connection pools for peak ramp concurrency (not just initial workers_per_core)
-        max_wpc = int(instance_config.get("max_workers_per_core", workers_per_core))
-        pool_sizing_workers = max(workers_per_core, max_wpc)
+        pool_sizing_workers = max(workers_per_core, settings.max_workers_per_core)
         storage_system = create_storage_system(
             storage_type, verbose_init=False, workers_per_core=pool_sizing_workers
         )
         persistence = ParquetPersistence()
 
-        cores = instance_config.get('vcpus', 1)
-        pipeline_depth = instance_config.get('pipeline_depth', 3)
-
         process_logger.info(f"Process {process_id}: Initializing with {workers_per_core} workers/core")
 
         worker_pool = WorkerPool(
             storage_system,
             process_id=process_id,
-            pipeline_depth=pipeline_depth,
-            shared_total_http_requests=shared_total_http_requests,
+            pipeline_depth=settings.pipeline_depth,
+            shared_state=shared_state,
         )
 
         # Start storage and workers
         async with storage_system:
             await worker_pool.start_workers(workers_per_core, object_key, phase_id)
 
-            start_time = time.time()
-            last_check_time = start_time
+            # Deadlines run on the monotonic clock so wall-clock (NTP) steps
+            # cannot stretch or cut short the phase; file names keep wall time
+            start_time = time.monotonic()
             last_flush_time = start_time
             current_workers_per_core = workers_per_core
 
-            flush_interval = instance_config.get('persistence_flush_interval_seconds', 60.0)
+            flush_interval = settings.flush_interval_seconds
+            flush_records = max(1, settings.flush_bytes_threshold // PERSISTENCE_RECORD_SIZE_ESTIMATE_BYTES)
+            loop = asyncio.get_running_loop()
+            # Parquet encoding and the disk write run here, off the event loop,
+            # so downloads keep flowing while a batch is flushed
+            writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"writer_{process_id}")
+
+            # Notifications of files written since the last send; every file of
+            # one loop iteration is reported to the main process in one message
+            pending_notifications = []
+
+            def _send_notifications() -> None:
+                if pending_notifications:
+                    result_conn.send_bytes(b''.join(pending_notifications))
+                    pending_notifications.clear()
+
+            async def _flush(suffix: str, fallback_phase: str) -> bool:
+                """Write the buffered records to one parquet file and report it to the main process.
+
+                Returns:
+                    True if records were written; on failure they are put back
+                """
+                records = worker_pool.take_records()
+                if not records:
+                    return False
+                # CRITICAL: Use worker_pool.current_phase_id, NOT the local phase_id,
+                # so the file tag matches the records inside
+                records_phase = worker_pool.current_phase_id or fallback_phase
+                phase_bytes = records_phase.encode()
+                if len(phase_bytes) > SHARED_STRING_BYTES:
+                    # struct would truncate it and the parent would file the records under another phase
+                    process_logger.error(f"Process {process_id}: Phase id too long to report, not flushed: {records_phase}")
+                    worker_pool.restore_records(records)
+                    return False
+                filename = f"benchmark_process{process_id}_phase_{records_phase}_{suffix}"
+                filepath = await loop.run_in_executor(
+                    writer, persistence.save_records_to_parquet, records, filename
+                )
+                if not filepath:
+                    worker_pool.restore_records(records)
+                    return False
+                path_bytes = filepath.encode()
+                if len(path_bytes) > RESULT_PATH_BYTES:
+                    # The parent could never collect the file: drop it and keep the records
+                    process_logger.error(f"Process {process_id}: Path too long to report, not flushed: {filepath}")
+                    try:
+                        os.remove(filepath)
+                    except OSError:
+                        pass
+                    worker_pool.restore_records(records)
+                    return False
+                pending_notifications.append(
+                    RESULT_MESSAGE.pack(process_id, len(records), phase_bytes, path_bytes)
+                )
+                process_logger.info(f"Process {process_id}: Flushed {len(records)} records for phase {records_phase}")
+                return True
+
+            # Flush signal already handled; the signal stays set until the main
+            # process restores the phase, so it must be acknowledged only once
+            handled_flush_signal = None
 
             while True:
+                current_time = time.monotonic()
+
                 # Check stop event or timeout
-                if stop_event.is_set() or (time.time() - start_time) >= duration_seconds:
+                if stop_event.is_set() or (current_time - start_time) >= duration_seconds:
                     break
 
-                current_time = time.time()
-
-                # Check for phase transitions every 2 seconds
-                if (current_time - last_check_time) >= 2.0:
-                    new_workers_per_core = shared_workers_per_core.value
-                    new_phase = shared_phase_id.value
-                    new_object_key = shared_object_key.value
-
-                    # Detect phase change (including flush signals)
-                    if new_phase != phase_id:
-                        process_logger.info(
-                            f"Process {process_id}: Phase transition detected: "
-                            f"{phase_id} → {new_phase}"
-                        )
-
-                        # Force flush if this is a flush signal (ends with _flush)
-                        if new_phase.endswith("_flush"):
-                            actual_phase = new_phase.replace("_flush", "")
-                            process_logger.info(f"Process {process_id}: Flush signal received for phase {actual_phase}")
-
-                            records = worker_pool.get_records()
-                            if len(records) > 0:
-                                # CRITICAL: Use phase_id from worker_pool to match records
-                                current_phase_for_records = worker_pool.current_phase_id or actual_phase
-
-                                filename = f"benchmark_process{process_id}_phase_{current_phase_for_records}_{int(current_time)}"
-                                filepath = persistence.save_records_to_parquet(records, filename)
-                                if filepath:
-                                    result_queue.put({
-                                        "type": "parquet_file",
-                                        "process_id": process_id,
-                                        "filepath": filepath,
-                                        "record_count": len(records),
-                                        "phase_id": current_phase_for_records  # Tag with ACTUAL phase in records
-                                    })
-                                    worker_pool.clear_records()
-                                    last_flush_time = current_time
-                                    process_logger.info(f"Process {process_id}: Flushed {len(records)} records for phase {current_phase_for_records}")
-
-                        # Update phase (don't update if it's just a flush signal)
-                        if not new_phase.endswith("_flush"):
-                            phase_id = new_phase
-                            # CRITICAL: Update worker pool phase_id immediately
-                            # This ensures workers use the new phase_id for all records
-                            worker_pool.current_phase_id = phase_id
-                            process_logger.warning(f"Process {process_id}: Phase updated to '{phase_id}'")
-
-                    # Detect worker count change
-                    if new_workers_per_core != current_workers_per_core:
-                        process_logger.warning(
-                            f"Process {process_id}: Ramp detected - "
-                            f"workers_per_core {current_workers_per_core} → {new_workers_per_core}, "
-                            f"phase_id={phase_id}"
-                        )
-                        # Adjust worker pool (this also updates phase_id, but we already did above)
-                        await worker_pool.start_workers(new_workers_per_core, new_object_key, phase_id)
-                        current_workers_per_core = new_workers_per_core
-
-                    last_check_time = current_time
-
-                # Periodic flush to disk to free memory
-                if (current_time - last_flush_time) >= flush_interval:
-                    records = worker_pool.get_records()
-                    if len(records) > 0:
-                        # CRITICAL: Use worker_pool.current_phase_id, NOT local phase_id variable
-                        # This ensures file tagging matches the actual records inside
-                        current_phase_for_records = worker_pool.current_phase_id or phase_id
+                # Check for phase transitions on every wake-up (phase_event pulse or fallback timeout)
+                # One lock for a consistent snapshot (the main process updates
+                # phase, key and worker counts together)
+                with shared_state.get_lock():
+                    new_workers_per_core = shared_state.workers_per_core
+                    new_phase = shared_state.phase_id.decode()
+                    new_object_key = shared_state.object_key.decode()
+
+                is_flush_signal = new_phase.endswith("_flush")
+                if not is_flush_signal:
+                    handled_flush_signal = None
+
+                # Detect phase change (including flush signals)
+                if new_phase != phase_id and new_phase != handled_flush_signal:
+                    process_logger.info(
+                        f"Process {process_id}: Phase transition detected: "
+                        f"{phase_id} → {new_phase}"
+                    )
 
+                    # Force flush if this is a flush signal (ends with _flush)
+                    if is_flush_signal:
+                        actual_phase = new_phase.replace("_flush", "")
+                        process_logger.info(f"Process {process_id}: Flush signal received for phase {actual_phase}")
+
+                        if await _flush(str(int(time.time())), actual_phase):
+                            last_flush_time = current_time
+                        # Acknowledge even with nothing to flush: the main
+                        # process waits until every worker has reported
+                        handled_flush_signal = new_phase
+                        # Report the files before the acknowledgement: the main
+                        # process reads stats once every worker has acknowledged
+                        _send_notifications()
+                        with shared_state.get_lock():
+                            shared_state.flush_acks += 1
+
+                    # Update phase (don't update if it's just a flush signal)
+                    else:
+                        phase_id = new_phase
+                        # CRITICAL: Update worker pool phase_id immediately
+                        # This ensures workers use the new phase_id for all records
+                        worker_pool.current_phase_id = phase_id
+                        process_logger.warning(f"Process {process_id}: Phase updated to '{phase_id}'")
+
+                # Detect worker count change
+                if new_workers_per_core != current_workers_per_core:
+                    process_logger.warning(
+                        f"Process {process_id}: Ramp detected - "
+                        f"workers_per_core {current_workers_per_core} → {new_workers_per_core}, "
+                        f"phase_id={phase_id}"
+                    )
+                    # Adjust worker pool (this also updates phase_id, but we already did above)
+                    await worker_pool.start_workers(new_workers_per_core, new_object_key, phase_id)
+                    current_workers_per_core = new_workers_per_core
+
+                # Periodic flush to disk to free memory: every flush_interval, or
+                # earlier once the buffered records reach the size threshold
+                if ((current_time - last_flush_time) >= flush_interval
+                        or len(worker_pool.get_records()) >= flush_records):
+                    if worker_pool.get_records():
                         # Use WARNING level so it shows in main log
-                        process_logger.warning(f"Process {process_id}: Periodic flush of {len(records)} records (phase={current_phase_for_records})")
-
-                        # Save to process-specific parquet file (tagged with phase FROM RECORDS)
-                        filename = f"benchmark_process{process_id}_phase_{current_phase_for_records}_{int(current_time)}"
-                        filepath = persistence.save_records_to_parquet(records, filename)
-
-                        if filepath:
-                            # Send filepath to main process with phase tag FROM RECORDS
-                            result_queue.put({
-                                "type": "parquet_file",
-                                "process_id": process_id,
-                                "filepath": filepath,
-                                "record_count": len(records),
-                                "phase_id": current_phase_for_records  # Tag with ACTUAL phase in records
-                            })
-
-                            # Clear from memory
-                            worker_pool.clear_records()
-
+                        process_logger.warning(f"Process {process_id}: Periodic flush of {len(worker_pool.get_records())} records")
+                        await _flush(str(int(time.time())), phase_id)
                         last_flush_time = current_time
 
-                await asyncio.sleep(0.5)
+                _send_notifications()
+
+                # Sleep until the main process signals a state change, the next
+                # flush is due, or the fallback check interval passes
+                now = time.monotonic()
+                timeout = min(
+                    PHASE_CHECK_INTERVAL_SECONDS,
+                    flush_interval - (now - last_flush_time),
+                    duration_seconds - (now - start_time),
+                )
+                await loop.run_in_executor(None, phase_event.wait, max(timeout, 0.0))
 
             # Final flush
             process_logger.info(f"Process {process_id}: Final flush")
             await worker_pool.stop_workers()
 
-            records = worker_pool.get_records()
-            if len(records) > 0:
-                # CRITICAL: Use phase_id from worker_pool to match records
-                current_phase_for_records = worker_pool.current_phase_id or phase_id
-
-                filename = f"benchmark_process{process_id}_phase_{current_phase_for_records}_final"
-                filepath = persistence.save_records_to_parquet(records, filename)
-                if filepath:
-                    result_queue.put({
-                        "type": "parquet_file",
-                        "process_id": process_id,
-                        "filepath": filepath,
-                        "record_count": len(records),
-                        "phase_id": current_phase_for_records  # Tag with ACTUAL phase in records
-                    })
+            await _flush("final", phase_id)
+            _send_notifications()
 
+            writer.shutdown(wait=True)
             await worker_pool.cleanup()
             process_logger.info(f"Process {process_id}: Cleanup complete")
 
@@ -284,21 +442,31 @@ class ProcessPool:
         self.persistence = persistence
         self.instance_config = instance_config
         self.cores = instance_config.get('vcpus', 1)
+        self.worker_settings = WorkerSettings.from_instance_config(instance_config)
 
         # Multiprocessing
-        mp_ctx = mp.get_context('spawn')
-        # Increase queue size - with 36 processes flushing every 15s over many phases,
-        # we can accumulate many messages. Make it unlimited to prevent blocking.
-        self.result_queue: mp.Queue = mp_ctx.Queue(maxsize=0)  # 0 = unlimited
+        # Processes, pipes, events and shared memory all come from one
+        # forkserver context: children start from a preloaded, single-threaded
+        # server instead of re-importing everything (spawn) or forking this
+        # process with its threads (fork)
+        mp_ctx = mp.get_context('forkserver')
+        mp_ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+        self.mp_ctx = mp_ctx
+        # One pipe per worker process (receive ends, opened in start_workers).
+        # Workers write their own pipe directly, with no feeder thread or
+        # shared queue lock; a drainer thread reads them as messages arrive so
+        # a pipe buffer never fills up
+        self.result_conns: List[Connection] = []
+        self._drainer: Optional[threading.Thread] = None
         self.stop_event: mp.Event = mp_ctx.Event()
+        # Pulsed after every shared-state change so worker processes react at
+        # once instead of on their next poll
+        self.phase_event: mp.Event = mp_ctx.Event()
 
-        # Shared state for phase transitions (allows dynamic ramping)
-        self.manager = mp.Manager()
-        self.shared_phase_id = self.manager.Value('s', '')
-        self.shared_object_key = self.manager.Value('s', '')
-        self.shared_workers_per_core = self.manager.Value('i', 0)
-        self.shared_total_workers = self.manager.Value('i', 0)
-        self.shared_total_http_requests = self.manager.Value('i', 0)  # Total HTTP requests for metrics
+        # Shared state for phase transitions (allows dynamic ramping): one
+        # shared-memory struct behind one lock, so an update of several fields
+        # is seen by workers all at once and reads are plain memory loads
+        self.shared_state = mp_ctx.Value(SharedState, lock=True)
 
         # State
         self.current_phase_id: Optional[str] = None
@@ -306,8 +474,14 @@ class ProcessPool:
         self.current_workers_per_core: int = 0
         self.processes: List[mp.Process] = []
 
-        # Collected parquet files
-        self.parquet_files: List[str] = []
+        # Collected parquet files in arrival order (consolidated at the end),
+        # plus an index by phase tag of the files get_step_stats has not read
+        # yet; a phase's entries are dropped once its stats are computed
+        self.collected_files: List[str] = []
+        self.files_by_phase: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._collected_paths: set = set()
+        # Guards the collections above and result_conns against the drainer thread
+        self._files_lock = threading.Lock()
 
         logger.info(
             f"ProcessPool: Configured for {self.cores} cores"
@@ -353,37 +527,37 @@ class ProcessPool:
             # Start workers (or adjust if already running)
             await self.start_workers(workers_per_core, self.current_object_key or "", phase_id)
 
-            # Wait for phase duration with progress logging (once per completed 30s bucket)
-            start_time = time.time()
+            # Wait for phase duration with a progress log every 30s
+            start_time = time.monotonic()
+            deadline = start_time + duration_seconds
             check_interval = 5.0  # Wake interval
-            last_logged_30s_bucket = -1
+            progress_interval = 30.0
+            next_log = start_time + progress_interval
 
-            while (time.time() - start_time) < duration_seconds:
-                remaining = duration_seconds - (time.time() - start_time)
-                await asyncio.sleep(min(check_interval, remaining))
-
-                elapsed = time.time() - start_time
-                bucket = int(elapsed // 30)
-                if bucket > 0 and bucket > last_logged_30s_bucket:
-                    last_logged_30s_bucket = bucket
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if now >= next_log:
                     logger.info(
-                        f"Phase '{phase_id}': ~{bucket * 30}s / {duration_seconds:.0f}s elapsed"
+                        f"Phase '{phase_id}': ~{next_log - start_time:.0f}s / {duration_seconds:.0f}s elapsed"
                     )
+                    next_log += progress_interval
+                await asyncio.sleep(min(check_interval, deadline - now, next_log - now))
 
             # Phase complete - force flush from all processes
             logger.info(f"Phase '{phase_id}' duration complete, forcing flush...")
 
             # Signal flush by updating phase ID with _flush suffix
-            flush_phase = f"{phase_id}_flush"
-            self.shared_phase_id.value = flush_phase
+            self._set_shared_state(phase_id=f"{phase_id}_flush", flush_acks=0)
+            self._signal_phase_change()
 
-            # Wait for processes to detect flush signal and flush
-            # Increased from 3s to 10s to handle memory pressure and 36 processes
-            logger.info(f"Waiting 10 seconds for {self.cores} processes to flush...")
-            await asyncio.sleep(10.0)
+            # Wait until every live process has flushed (instead of a fixed grace period)
+            await self._wait_for_flush_acks()
 
             # Restore actual phase ID
-            self.shared_phase_id.value = phase_id
+            self._set_shared_state(phase_id=phase_id)
+            self._signal_phase_change()
 
             # Collect stats for this phase (with retry logic)
             stats = self.get_step_stats(phase_id)
@@ -471,11 +645,14 @@ class ProcessPool:
             )
 
             # Update shared state - all processes will pick up new values
-            self.shared_phase_id.value = phase_id
-            self.shared_object_key.value = object_key
-            self.shared_workers_per_core.value = workers_per_core
-            self.shared_total_workers.value = total_workers
-            self.shared_total_http_requests.value = total_http_requests
+            self._set_shared_state(
+                phase_id=phase_id,
+                object_key=object_key,
+                workers_per_core=workers_per_core,
+                total_workers=total_workers,
+                total_http_requests=total_http_requests,
+            )
+            self._signal_phase_change()
 
             # Wait a moment for all processes to pick up the phase change
             # This prevents records from old phase ending up in new phase files
@@ -492,19 +669,24 @@ class ProcessPool:
         )
 
         # Initialize shared state
-        self.shared_phase_id.value = phase_id
-        self.shared_object_key.value = object_key
-        self.shared_workers_per_core.value = workers_per_core
-        self.shared_total_workers.value = total_workers
-        self.shared_total_http_requests.value = total_http_requests
+        self._set_shared_state(
+            phase_id=phase_id,
+            object_key=object_key,
+            workers_per_core=workers_per_core,
+            total_workers=total_workers,
+            total_http_requests=total_http_requests,
+        )
 
-        # Clear stop event
+        # Clear stop and phase events
         self.stop_event.clear()
+        self.phase_event.clear()
 
-        # Spawn processes (one per core)
+        # Spawn processes (one per core), each with its own result pipe
         self.processes = []
+        self.result_conns = []
         for i in range(self.cores):
-            process = mp.Process(
+            result_recv, result_send = self.mp_ctx.Pipe(duplex=False)
+            process = self.mp_ctx.Process(
                 target=_run_worker_process,
                 args=(
                     i,
@@ -513,143 +695,154 @@ class ProcessPool:
                     workers_per_core,
                     phase_id,
                     float('inf'),  # Run until stopped
-                    self.instance_config,
-                    self.result_queue,
+                    self.worker_settings,
+                    result_send,
                     self.stop_event,
-                    self.shared_phase_id,
-                    self.shared_object_key,
-                    self.shared_workers_per_core,
-                    self.shared_total_workers,
-                    self.shared_total_http_requests
+                    self.phase_event,
+                    self.shared_state,
                 )
             )
             process.start()
+            # The child holds its own copy; closing ours lets recv() see EOF once it exits
+            result_send.close()
             self.processes.append(process)
+            self.result_conns.append(result_recv)
+
+        self._drainer = threading.Thread(target=self._drain_results, name="result_drainer", daemon=True)
+        self._drainer.start()
 
         logger.info(f"All {self.cores} cores started with {workers_per_core} workers/core")
 
+    async def _wait_for_flush_acks(self) -> None:
+        """Wait until every live worker process acknowledged the flush signal.
+
+        Gives up after FLUSH_BARRIER_TIMEOUT_SECONDS; records of late processes
+        then land in a later file of the same phase.
+        """
+        target = sum(1 for p in self.processes if p.is_alive())
+        logger.info(f"Waiting for {target} processes to flush...")
+        start_time = time.monotonic()
+        deadline = start_time + FLUSH_BARRIER_TIMEOUT_SECONDS
+        while self.shared_state.flush_acks < target:
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Flush barrier timed out: {self.shared_state.flush_acks}/{target} processes flushed "
+                    f"within {FLUSH_BARRIER_TIMEOUT_SECONDS:.0f}s"
+                )
+                return
+            await asyncio.sleep(FLUSH_BARRIER_POLL_SECONDS)
+        logger.info(f"All {target} processes flushed in {time.monotonic() - start_time:.1f}s")
+
+    def _set_shared_state(self, **fields) -> None:
+        """Update SharedState fields under its lock (strings are stored UTF-8 encoded)."""
+        with self.shared_state.get_lock():
+            for name, value in fields.items():
+                setattr(self.shared_state, name, value.encode() if isinstance(value, str) else value)
+
+    def _signal_phase_change(self) -> None:
+        """Wake every worker process blocked on phase_event to re-read the shared state.
+
+        set() returns once all current waiters are woken, so the event can be
+        cleared right away for the next change.
+        """
+        self.phase_event.set()
+        self.phase_event.clear()
+
+    def _drain_results(self) -> None:
+        """Drainer thread: file parquet notifications as they arrive, until every worker pipe is closed."""
+        while self.result_conns:
+            for conn in wait(self.result_conns):
+                # Read and file under the lock, so a message is either still
+                # in its pipe or already in files_by_phase (see _wait_for_drained)
+                with self._files_lock:
+                    try:
+                        batch = conn.recv_bytes()
+                    except EOFError:
+                        # Worker exited and its pipe is drained
+                        self.result_conns.remove(conn)
+                        conn.close()
+                        continue
+                    # One send may carry several concatenated notifications
+                    for msg in RESULT_MESSAGE.iter_unpack(batch):
+                        self._register_parquet_file(msg)
+
+    def _register_parquet_file(self, msg: tuple) -> None:
+        """Add one unpacked RESULT_MESSAGE to collected_files and files_by_phase (caller holds _files_lock)."""
+        _, record_count, phase_bytes, path_bytes = msg
+        filepath = path_bytes.rstrip(b'\0').decode()
+        if filepath and filepath not in self._collected_paths and os.path.exists(filepath):
+            msg_phase = phase_bytes.rstrip(b'\0').decode() or "unknown"
+            self._collected_paths.add(filepath)
+            self.collected_files.append(filepath)
+            self.files_by_phase[msg_phase].append({
+                'path': filepath,
+                'phase_id': msg_phase,
+                'record_count': record_count,
+            })
+
+    def _wait_for_drained(self, max_wait: float) -> None:
+        """Wait until the drainer has filed every notification already written to a pipe."""
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
+            with self._files_lock:
+                if not self.result_conns or not wait(self.result_conns, timeout=0):
+                    return
+            time.sleep(DRAIN_POLL_SECONDS)
+
     def get_step_stats(self, phase_id: str) -> Optional[Dict[str, Any]]:
         """Get statistics for a phase.
 
         This is called after a phase completes to get aggregated stats.
         Since records are on disk, this loads and analyzes parquet files.
         """
-        # Collect any pending parquet files from queue (with retry)
-        import queue
-        import time as time_module
-
-        # Retry collection for up to 5 seconds (handles delayed queue messages)
-        retry_deadline = time_module.time() + 5.0
-        files_before = len(self.parquet_files)
-
-        while time_module.time() < retry_deadline:
-            collected_this_round = 0
-            while not self.result_queue.empty():
-                try:
-                    msg = self.result_queue.get_nowait()
-                    if msg.get("type") == "parquet_file":
-                        filepath = msg.get("filepath")
-                        msg_phase = msg.get("phase_id", "unknown")
-
-                        if filepath and os.path.exists(filepath):
-                            # Store as dict with phase tag
-                            file_info = {
-                                'path': filepath,
-                                'phase_id': msg_phase,
-                                'record_count': msg.get("record_count", 0)
-                            }
-                            # Check if not already added
-                            if not any(f['path'] == filepath for f in self.parquet_files):
-                                self.parquet_files.append(file_info)
-                                collected_this_round += 1
-                except queue.Empty:
-                    break
-
-            # If we collected files this round, keep trying
-            if collected_this_round > 0:
-                logger.debug(f"Collected {collected_this_round} more files, checking for more...")
-                time_module.sleep(0.5)
-            else:
-                # No new files, exit early
-                break
-
-        files_collected = len(self.parquet_files) - files_before
-        logger.info(f"Collected {files_collected} parquet files for phase '{phase_id}' (total accumulated: {len(self.parquet_files)})")
-
-        if not self.parquet_files:
+        # Workers report their files before acknowledging the flush, so once
+        # the pipes are drained every flushed file of the phase is indexed
+        self._wait_for_drained(DRAIN_WAIT_SECONDS)
+        # Only the files tagged with this phase are opened
+        with self._files_lock:
+            phase_files = list(self.files_by_phase.get(phase_id, []))
+        logger.info(f"{len(phase_files)} parquet files tagged with phase '{phase_id}'")
+
+        if not phase_files:
             logger.warning(f"No parquet files collected for phase {phase_id}")
             return None
 
-        # Load and analyze parquet files (only for this phase)
-        from common.metrics_utils import (
-            calculate_phase_throughput_with_prorating,
-            calculate_latency_stats,
-            successful_request_mask,
-        )
+        try:
+            # One scan over all the phase's files: the phase_id filter and the
+            # column projection are applied by the reader, so other phases' row
+            # groups and unused columns are never decoded
+            dataset = ds.dataset([f['path'] for f in phase_files], format='parquet')
+            table = dataset.to_table(filter=ds.field('phase_id') == phase_id, columns=STEP_STATS_COLUMNS)
+        except Exception as e:
+            logger.error(f"Error loading parquet files for phase {phase_id}: {e}")
+            return None
 
-        # Debug: show phase distribution
-        phase_counts = {}
-        for f in self.parquet_files:
-            fp = f.get('phase_id', 'unknown')
-            phase_counts[fp] = phase_counts.get(fp, 0) + 1
-        logger.info(f"File phase distribution: {phase_counts}")
-
-        dfs = []
-        files_loaded = 0
-        files_checked = 0
-        files_skipped = 0
-        for file_info in self.parquet_files:
-            file_phase = file_info.get('phase_id', '')
-            filepath = file_info.get('path', '')
-
-            # Match by phase_id tag or filename contains phase_id
-            if not (file_phase == phase_id or f"_phase_{phase_id}" in filepath or f"_phase_{phase_id}_" in filepath):
-                files_skipped += 1
-                continue
-
-            # File matches - try to load it
-            files_checked += 1
+        # The phase's rows are in memory; its files only stay in collected_files
+        # and are not read again until the final consolidation, so their pages
+        # need not displace the workers' in the page cache
+        _drop_from_page_cache([f['path'] for f in phase_files])
+        with self._files_lock:
+            # Keep files the drainer filed for this phase during the scan
+            unread = self.files_by_phase[phase_id][len(phase_files):]
+            if unread:
+                self.files_by_phase[phase_id] = unread
+            else:
+                del self.files_by_phase[phase_id]
 
-            try:
-                df = pd.read_parquet(filepath)
-                # Check what phase_ids are actually in the file
-                unique_phases = df['phase_id'].unique() if 'phase_id' in df.columns else []
-
-                # Log first 3 files to see what's inside
-                if files_checked <= 3:
-                    logger.warning(f"File {os.path.basename(filepath)}: contains phases {list(unique_phases)}, looking for '{phase_id}', records={len(df)}")
-
-                # Additional filter by phase_id column
-                phase_df = df[df['phase_id'] == phase_id]
-                if len(phase_df) > 0:
-                    dfs.append(phase_df)
-                    files_loaded += 1
-                    if files_checked <= 3:
-                        logger.warning(f"  ✓ Loaded {len(phase_df)} records from this file")
-                else:
-                    # Log ALL mismatches (this is the bug we're hunting)
-                    if files_checked <= 10:  # Log first 10 mismatches
-                        logger.warning(f"  ✗ File tagged as '{file_phase}' contains phases {list(unique_phases)}, NOT '{phase_id}'")
-
-            except Exception as e:
-                logger.error(f"Error loading {filepath}: {e}")
-
-        logger.info(f"Phase '{phase_id}': Checked {files_checked} files, skipped {files_skipped}, loaded {files_loaded} with matching data")
-
-        if not dfs:
+        logger.info(f"Phase '{phase_id}': loaded {table.num_rows} records from {len(phase_files)} files")
+
+        if table.num_rows == 0:
             logger.warning(f"No data found for phase {phase_id}")
             return None
 
-        # Concatenate all data
-        records_df = pd.concat(dfs, ignore_index=True)
-
-        # Calculate stats
-        successful_df = records_df[successful_request_mask(records_df)]
-        total_requests = len(records_df)
-        successful_requests = len(successful_df)
+        # Reduce on the Arrow columns directly; only the columns the prorating
+        # needs are converted to pandas
+        success_mask = pc.is_in(table['http_status'], value_set=SUCCESS_STATUSES)
+        total_requests = table.num_rows
+        successful_requests = pc.sum(success_mask).as_py() or 0
         error_rate = 1.0 - (successful_requests / total_requests) if total_requests > 0 else 1.0
 
-        if len(successful_df) == 0:
+        if successful_requests == 0:
             return {
                 "phase_id": phase_id,
                 "total_http_requests": 0,
@@ -666,32 +859,44 @@ class ProcessPool:
                 "total_bytes": 0,
             }
 
-        # Calculate throughput and latency
-        throughput_result = calculate_phase_throughput_with_prorating(successful_df, phase_id)
-        latency_stats = calculate_latency_stats(successful_df)
+        successful = table.filter(success_mask)
+        throughput_result = calculate_phase_throughput_with_prorating(
+            successful.select(THROUGHPUT_COLUMNS).to_pandas(), phase_id
+        )
+
+        # NaN latencies are skipped, as in calculate_latency_stats; quantile
+        # interpolates linearly like np.percentile
+        latency = successful['latency_ms']
+        latency = pc.filter(latency, pc.invert(pc.is_nan(latency)))
+        if len(latency) > 0:
+            avg_latency = pc.mean(latency).as_py()
+            p50, p95, p99 = pc.quantile(latency, q=[0.5, 0.95, 0.99]).to_pylist()
+        else:
+            avg_latency = p50 = p95 = p99 = float('nan')
 
         return {
             "phase_id": phase_id,
-            "total_http_requests": successful_df['concurrency'].iloc[0] if len(successful_df) > 0 else 0,
+            "total_http_requests": successful['concurrency'][0].as_py(),
             "total_requests": total_requests,
             "successful_requests": successful_requests,
             "error_requests": total_requests - successful_requests,
             "error_rate": error_rate,
             "throughput_gbps": throughput_result['throughput_gbps'],
             "duration_seconds": throughput_result['duration_seconds'],
-            "avg_latency_ms": latency_stats["avg"],
-            "p50_latency_ms": latency_stats["p50"],
-            "p95_latency_ms": latency_stats["p95"],
-            "p99_latency_ms": latency_stats["p99"],
-            "total_bytes": int(successful_df['bytes'].sum()),
+            "avg_latency_ms": avg_latency,
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "p99_latency_ms": p99,
+            "total_bytes": pc.sum(successful['bytes']).as_py(),
         }
 
     async def cleanup(self):
         """Stop all processes and cleanup."""
         logger.info("Stopping all processes...")
 
-        # Signal stop
+        # Signal stop (and wake processes waiting for a phase change)
         self.stop_event.set()
+        self.phase_event.set()
 
         # Wait for processes
         for i, process in enumerate(self.processes):
@@ -702,26 +907,9 @@ class ProcessPool:
                 process.join()
             logger.info(f"Process {i} stopped")
 
-        # Collect any remaining parquet files
-        import queue
-        while not self.result_queue.empty():
-            try:
-                msg = self.result_queue.get_nowait()
-                if msg.get("type") == "parquet_file":
-                    filepath = msg.get("filepath")
-                    msg_phase = msg.get("phase_id", "unknown")
-
-                    if filepath and os.path.exists(filepath):
-                        file_info = {
-                            'path': filepath,
-                            'phase_id': msg_phase,
-                            'record_count': msg.get("record_count", 0)
-                        }
-                        # Check if not already added
-                        if not any(f['path'] == filepath for f in self.parquet_files):
-                            self.parquet_files.append(file_info)
-            except queue.Empty:
-                break
-
-        logger.info(f"Collected {len(self.parquet_files)} parquet files from all cores")
+        # All senders have exited, so the drainer reads each pipe to EOF and stops
+        if self._drainer is not None:
+            self._drainer.join()
+
+        logger.info(f"Collected {len(self.collected_files)} parquet files from all cores")
         logger.info("ProcessPool cleanup complete")
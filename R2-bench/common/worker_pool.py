@@ -8,10 +8,11 @@ Each worker pipelines multiple HTTP requests for maximum throughput.
 import asyncio
 import time
 import logging
-import random
 from typing import Dict, Any, List, Optional
 
-from persistence.record import BenchmarkRecord
+import numpy as np
+
+from persistence.record import RecordBuffer
 from configuration import (
     RANGE_SIZE_MB,
     BYTES_PER_MB,
@@ -26,6 +27,9 @@ from configuration import (
 
 logger = logging.getLogger(__name__)
 
+# Pre-computed range starts per process (8 bytes each in a NumPy array)
+RANGE_CACHE_SIZE = 1 << 20
+
 
 class WorkerPool:
     """Async worker pool for a single process."""
@@ -35,7 +39,7 @@ class WorkerPool:
         storage_system,
         process_id: int,
         pipeline_depth: int,
-        shared_total_http_requests,
+        shared_state,
     ):
         """Initialize worker pool.
 
@@ -43,12 +47,13 @@ class WorkerPool:
             storage_system: Storage system for downloads
             process_id: Process ID (core ID)
             pipeline_depth: Number of in-flight requests per worker
-            shared_total_http_requests: Shared value containing total HTTP requests across all cores
+            shared_state: Shared process-pool state; total_http_requests is read from it
         """
         self.storage_system = storage_system
         self.process_id = process_id
         self.pipeline_depth = pipeline_depth
-        self.shared_total_http_requests = shared_total_http_requests
+        self.shared_state = shared_state
+        self._range_length = RANGE_SIZE_MB * BYTES_PER_MB
 
         # Worker management
         self.worker_tasks: List[asyncio.Task] = []
@@ -65,24 +70,25 @@ class WorkerPool:
         # Worker state
         self.worker_states: Dict[int, Dict[str, Any]] = {}
 
-        # Phase records (in-memory, will be flushed to disk)
-        self.phase_records: List[BenchmarkRecord] = []
+        # Phase records (in-memory, column-wise, will be flushed to disk)
+        self.phase_records = RecordBuffer()
 
         # Pre-compute random ranges for performance
-        self._range_cache = self._precompute_ranges(10000)
+        self._range_cache = self._precompute_ranges(RANGE_CACHE_SIZE)
         self._range_index = 0
 
         logger.debug(f"Process {process_id}: WorkerPool initialized")
 
-    def _precompute_ranges(self, count: int) -> List[int]:
-        """Pre-compute random range starts to avoid overhead during requests."""
+    def _precompute_ranges(self, count: int) -> np.ndarray:
+        """Pre-compute random range starts in one vectorized draw."""
         range_length = RANGE_SIZE_MB * BYTES_PER_MB
         max_start = (OBJECT_SIZE_GB * BYTES_PER_GB) - range_length
-        return [random.randint(0, max_start) for _ in range(count)]
+        rng = np.random.default_rng()
+        return rng.integers(0, max_start, size=count, dtype=np.int64, endpoint=True)
 
     def _get_next_range_start(self) -> int:
         """Get next pre-computed range start."""
-        range_start = self._range_cache[self._range_index]
+        range_start = int(self._range_cache[self._range_index])
         self._range_index = (self._range_index + 1) % len(self._range_cache)
         return range_start
 
@@ -99,7 +105,7 @@ class WorkerPool:
 
         # Update cached total_http_requests once per phase transition
         # This eliminates ~30,720 IPC calls/sec by reading from shared memory only here
-        self._cached_total_http_requests = self.shared_total_http_requests.value
+        self._cached_total_http_requests = self.shared_state.total_http_requests
         logger.debug(
             f"Process {self.process_id}: Cached total_http_requests={self._cached_total_http_requests} "
             f"for phase '{phase_id}'"
@@ -117,11 +123,7 @@ class WorkerPool:
 
         # Initialize worker states
         for i in range(workers_per_core):
-            self.worker_states[i] = {
-                "object_key": object_key,
-                "consecutive_errors": 0,
-                "requests_completed": 0,
-            }
+            self.worker_states[i] = self._new_worker_state(object_key)
 
         # Start workers
         for i in range(workers_per_core):
@@ -138,83 +140,127 @@ class WorkerPool:
             # Add workers
             self.active_workers = target_workers
             for i in range(current, target_workers):
-                self.worker_states[i] = {
-                    "object_key": object_key,
-                    "consecutive_errors": 0,
-                    "requests_completed": 0,
-                }
+                # Fresh state: a retired worker with this id may still be draining
+                self.worker_states[i] = self._new_worker_state(object_key)
                 task = asyncio.create_task(self._worker_task(i))
                 self.worker_tasks.append(task)
             logger.debug(f"Process {self.process_id}: Increased workers {current} → {target_workers}")
         elif target_workers < current:
-            # Reduce workers (they'll stop naturally when they check active_workers)
+            # Reduce workers (retired workers finish their in-flight requests)
             self.active_workers = target_workers
+            for i in range(target_workers, current):
+                self.worker_states[i]["stop"].set()
             logger.debug(f"Process {self.process_id}: Reduced workers {current} → {target_workers}")
 
+    @staticmethod
+    def _new_worker_state(object_key: str) -> Dict[str, Any]:
+        """Create the state of one worker, including its own stop event."""
+        return {
+            "object_key": object_key,
+            "consecutive_errors": 0,
+            "requests_completed": 0,
+            "stop": asyncio.Event(),
+        }
+
     async def _worker_task(self, worker_id: int):
-        """Main worker loop with request pipelining."""
-        worker_state = self.worker_states[worker_id]
+        """Main worker loop with request pipelining.
 
-        while not self.stop_event.is_set():
-            # Check if this worker should stop
-            if worker_id >= self.active_workers:
-                break
+        Keeps pipeline_depth requests in flight as a sliding window: a new
+        request starts as soon as any one completes, instead of waiting for
+        the slowest request of a batch.
+        """
+        worker_state = self.worker_states[worker_id]
+        stop = worker_state["stop"]
+        inflight = set()
+        stopping = False
+
+        try:
+            while True:
+                # Check if this worker should stop (in-flight requests still complete)
+                stopping = stopping or stop.is_set() or self.stop_event.is_set()
+
+                if not stopping:
+                    # Check for phase transition (object key change)
+                    if worker_state["object_key"] != self.current_object_key:
+                        worker_state["object_key"] = self.current_object_key
+                        worker_state["consecutive_errors"] = 0
 
-            # Check for phase transition (object key change)
-            if worker_state["object_key"] != self.current_object_key:
-                worker_state["object_key"] = self.current_object_key
-                worker_state["consecutive_errors"] = 0
+                    # Refill the pipeline
+                    while len(inflight) < self.pipeline_depth:
+                        inflight.add(asyncio.create_task(self._download_request(worker_id)))
 
-            # Pipeline multiple requests
-            tasks = []
-            for _ in range(self.pipeline_depth):
-                if not self.stop_event.is_set() and worker_id < self.active_workers:
-                    tasks.append(self._download_request(worker_id))
+                if not inflight:
+                    break
 
-            if tasks:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
 
-                # Process results
-                for result in results:
-                    if isinstance(result, Exception):
-                        worker_state["consecutive_errors"] += 1
-                    elif result:  # Success
+                # Process results (_download_request reports failure as False, never raises)
+                for task in done:
+                    if task.result():  # Success
                         worker_state["consecutive_errors"] = 0
                         worker_state["requests_completed"] += 1
                     else:  # Failure
                         worker_state["consecutive_errors"] += 1
 
-            # Handle consecutive errors with exponential backoff or stop
-            if worker_state["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
-                if ERROR_BACKOFF_ENABLED:
-                    # Exponential backoff: wait longer as errors accumulate
-                    # Formula: min(2^(errors/20), ERROR_BACKOFF_MAX_SECONDS)
-                    backoff_time = min(2 ** (worker_state["consecutive_errors"] / 20), ERROR_BACKOFF_MAX_SECONDS)
-                    logger.warning(
-                        f"Process {self.process_id} worker {worker_id}: "
-                        f"{worker_state['consecutive_errors']} consecutive errors, "
-                        f"backing off for {backoff_time:.2f}s"
-                    )
-                    await asyncio.sleep(backoff_time)
-                    # Reset error counter after backoff to give the system another chance
-                    worker_state["consecutive_errors"] = int(worker_state["consecutive_errors"] * 0.5)
-                else:
-                    logger.error(f"Process {self.process_id} worker {worker_id}: Too many consecutive errors, stopping")
-                    break
+                stopping = await self._handle_consecutive_errors(worker_id, worker_state) or stopping
+        finally:
+            # Only non-empty if this task itself was cancelled
+            for task in inflight:
+                task.cancel()
+
+    async def _handle_consecutive_errors(self, worker_id: int, worker_state: Dict[str, Any]) -> bool:
+        """Back off after too many consecutive errors.
+
+        Returns:
+            True if the worker should stop instead (backoff disabled)
+        """
+        if worker_state["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
+            if ERROR_BACKOFF_ENABLED:
+                # Exponential backoff: wait longer as errors accumulate
+                # Formula: min(2^(errors/20), ERROR_BACKOFF_MAX_SECONDS)
+                backoff_time = min(2 ** (worker_state["consecutive_errors"] / 20), ERROR_BACKOFF_MAX_SECONDS)
+                logger.warning(
+                    f"Process {self.process_id} worker {worker_id}: "
+                    f"{worker_state['consecutive_errors']} consecutive errors, "
+                    f"backing off for {backoff_time:.2f}s"
+                )
+                await self._sleep_unless_stopped(backoff_time)
+                # Reset error counter after backoff to give the system another chance
+                worker_state["consecutive_errors"] = int(worker_state["consecutive_errors"] * 0.5)
+            else:
+                logger.error(f"Process {self.process_id} worker {worker_id}: Too many consecutive errors, stopping")
+                return True
+        return False
+
+    async def _sleep_unless_stopped(self, delay: float) -> bool:
+        """Sleep for a backoff delay, waking early if the pool is stopping.
+
+        Returns:
+            True if stop_event was set before the delay elapsed
+        """
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def _download_request(self, worker_id: int) -> bool:
         """Execute single download with retry.
 
-        Persists one BenchmarkRecord per logical request (success or final failure).
-        retry_count: failed attempts before success, or MAX_RETRIES if all attempts failed.
+        Persists one record per logical request (success or final failure).
+        retry_count: failed attempts before success, or the failed attempts (MAX_RETRIES
+        unless cut short by stop_workers) if the request failed.
 
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (errors are recorded, not raised)
         """
         range_start = self._get_next_range_start()
-        range_length = RANGE_SIZE_MB * BYTES_PER_MB
+        range_length = self._range_length
+        download_range = self.storage_system.download_range
+        thread_id = worker_id + (self.process_id * 10000)
         first_start: Optional[float] = None
         last_http_status = HTTP_STATUS_NO_RESPONSE
+        failed_attempts = MAX_RETRIES
 
         for attempt in range(MAX_RETRIES):
             try:
@@ -223,18 +269,17 @@ class WorkerPool:
                     first_start = start_time
                 object_key = self.current_object_key
 
-                data, latency_ms, rtt_ms, http_status = await self.storage_system.download_range(
+                data, latency_ms, rtt_ms, http_status = await download_range(
                     object_key, range_start, range_length
                 )
                 end_time = time.time()
                 last_http_status = int(http_status)
 
                 if data:
-                    current_phase_id = self.current_phase_id
-                    concurrency = self._cached_total_http_requests
-
-                    record = BenchmarkRecord(
-                        thread_id=worker_id + (self.process_id * 10000),
+                    # Read after the await: the phase and the record buffer
+                    # (swapped by take_records) may have changed meanwhile
+                    self.phase_records.append(
+                        thread_id=thread_id,
                         conn_id=worker_id,
                         object_key=object_key,
                         range_start=range_start,
@@ -243,31 +288,29 @@ class WorkerPool:
                         latency_ms=latency_ms,
                         rtt_ms=rtt_ms,
                         http_status=last_http_status,
-                        concurrency=concurrency,
+                        concurrency=self._cached_total_http_requests,
                         retry_count=attempt,
-                        phase_id=current_phase_id,
+                        phase_id=self.current_phase_id,
                         start_ts=first_start,
                         end_ts=end_time,
                     )
-                    self.phase_records.append(record)
                     return True
 
-                if attempt < MAX_RETRIES - 1:
-                    backoff = min(2 ** attempt, 30)
-                    await asyncio.sleep(backoff)
-
             except Exception as e:
                 last_http_status = HTTP_STATUS_NO_RESPONSE
-                if attempt < MAX_RETRIES - 1:
-                    await asyncio.sleep(min(2 ** attempt, 30))
-                else:
+                if attempt == MAX_RETRIES - 1:
                     logger.debug(
                         f"Process {self.process_id} worker {worker_id}: All retries failed: {e}"
                     )
 
+            if attempt < MAX_RETRIES - 1 and await self._sleep_unless_stopped(min(2 ** attempt, 30)):
+                # Pool is stopping: give up instead of retrying
+                failed_attempts = attempt + 1
+                break
+
         end_time = time.time()
-        fail_record = BenchmarkRecord(
-            thread_id=worker_id + (self.process_id * 10000),
+        self.phase_records.append(
+            thread_id=thread_id,
             conn_id=worker_id,
             object_key=self.current_object_key,
             range_start=range_start,
@@ -277,12 +320,11 @@ class WorkerPool:
             rtt_ms=0.0,
             http_status=last_http_status,
             concurrency=self._cached_total_http_requests,
-            retry_count=MAX_RETRIES,
+            retry_count=failed_attempts,
             phase_id=self.current_phase_id,
             start_ts=first_start if first_start is not None else end_time,
             end_ts=end_time,
         )
-        self.phase_records.append(fail_record)
         return False
 
     async def stop_workers(self):
@@ -296,13 +338,24 @@ class WorkerPool:
         self.active_workers = 0
         logger.debug(f"Process {self.process_id}: All workers stopped")
 
-    def get_records(self) -> List[BenchmarkRecord]:
+    def get_records(self) -> RecordBuffer:
         """Get all records collected by this worker pool."""
         return self.phase_records
 
     def clear_records(self):
         """Clear records from memory (after flushing to disk)."""
-        self.phase_records = []
+        self.phase_records = RecordBuffer()
+
+    def take_records(self) -> RecordBuffer:
+        """Detach the collected records; new downloads go to a fresh buffer."""
+        records = self.phase_records
+        self.phase_records = RecordBuffer()
+        return records
+
+    def restore_records(self, records: RecordBuffer):
+        """Put records whose flush failed back ahead of the newer ones."""
+        records.extend(self.phase_records)
+        self.phase_records = records
 
     async def cleanup(self):
         """Clean up resources."""
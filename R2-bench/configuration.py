@@ -114,6 +114,10 @@ SECONDS_PER_MINUTE: int = 60
 
 THROUGHPUT_WINDOW_SIZE_SECONDS: float = 30.0  # Window size for throughput timeline plots
 PER_SECOND_WINDOW_SIZE_SECONDS: float = 1.0  # Window size for per-second throughput calculations
+PLOT_DPI: int = 150  # Resolution for saved plots (300 quadrupled the pixels Agg/libpng had to encode)
+PLOT_FORMAT: str = os.getenv("PLOT_FORMAT", "png")  # png, svg (small for line/bar figures) or webp
+PLOT_FORMATS: tuple = ("png", "svg", "webp")
+PRORATE_BLOCK_ROWS: int = 65536  # Requests per block when prorating over all phases (bounds the requests x phases temporaries)
 
 # =============================================================================
 # WORKER POOL CONFIGURATION
@@ -121,6 +125,7 @@ PER_SECOND_WINDOW_SIZE_SECONDS: float = 1.0  # Window size for per-second throug
 
 # Per-core limits
 MAX_WORKERS_PER_CORE: int = 256  # Maximum async workers per core (safety limit for memory)
+PIN_WORKER_PROCESSES: bool = os.getenv("PIN_WORKER_PROCESSES", "0") == "1"  # Opt-in: pin each worker process (and its writer threads) to one CPU (Linux only)
 
 # Pipeline configuration
 PIPELINE_DEPTH: int = int(os.getenv("PIPELINE_DEPTH", "3"))  # Default 3; set 6 with 50 MB chunks for latency experiments
@@ -131,6 +136,8 @@ EXECUTOR_THREADS_PER_CORE: int = 2  # Minimal threads for disk writes
 # Persistence configuration
 PERSISTENCE_BATCH_SIZE: int = 200  # Number of records to batch before writing
 PERSISTENCE_FLUSH_INTERVAL_SECONDS: float = 15.0  # Flush to disk every 15s to free memory (reduced from 30s for aggressive memory management)
+PERSISTENCE_FLUSH_BYTES_THRESHOLD: int = 32 * 1024 * 1024  # Also flush early once buffered records reach ~32 MB
+PERSISTENCE_RECORD_SIZE_ESTIMATE_BYTES: int = 112  # Approximate in-memory size of one buffered record (12 packed 8-byte columns + 2 string refs)
 CONSOLIDATION_BATCH_SIZE: int = 50  # Number of parquet files to process per batch during consolidation (reduces memory usage)
 
 # Network configuration
@@ -5,15 +5,37 @@ Parquet persistence for benchmark results with thread-safe operations.
 import os
 import logging
 import threading
-from typing import List, Optional
+from array import array
+from typing import List, Optional, Union
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from persistence.record import BenchmarkRecord
+from persistence.record import BenchmarkRecord, RecordBuffer
 
 logger = logging.getLogger(__name__)
 
+# Arrow schema of flushed record buffers (BenchmarkRecord field order)
+RECORD_SCHEMA = pa.schema([
+    pa.field('thread_id', pa.int64()),
+    pa.field('conn_id', pa.int64()),
+    pa.field('object_key', pa.string()),
+    pa.field('range_start', pa.int64()),
+    pa.field('range_len', pa.int64()),
+    pa.field('bytes', pa.int64()),
+    pa.field('latency_ms', pa.float64()),
+    pa.field('rtt_ms', pa.float64()),
+    pa.field('http_status', pa.int64()),
+    pa.field('concurrency', pa.int64()),
+    pa.field('retry_count', pa.int64()),
+    pa.field('phase_id', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('start_ts', pa.float64()),
+    pa.field('end_ts', pa.float64()),
+])
+
 
 class ParquetPersistence:
     """Thread-safe Parquet file persistence for benchmark records.
@@ -96,6 +118,9 @@ class ParquetPersistence:
                 })
 
             df = pd.DataFrame(data)
+            # Low-cardinality labels: stored dictionary-encoded and read back
+            # as categoricals without a string-to-category conversion
+            df['phase_id'] = df['phase_id'].astype('category')
 
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -117,11 +142,12 @@ class ParquetPersistence:
         """Alias for save_to_parquet for backward compatibility."""
         return self.save_to_parquet(filename_prefix)
 
-    def save_records_to_parquet(self, records: List[BenchmarkRecord], filename_prefix: str) -> Optional[str]:
+    def save_records_to_parquet(self, records: Union[RecordBuffer, List[BenchmarkRecord]],
+                                filename_prefix: str) -> Optional[str]:
         """Save provided records directly to a Parquet file (for periodic flushing).
 
         Args:
-            records: List of benchmark records to save
+            records: Column-wise record buffer or list of benchmark records to save
             filename_prefix: Prefix for the generated filename
 
         Returns:
@@ -130,7 +156,47 @@ class ParquetPersistence:
         if not records:
             return None
 
-        # Convert records to DataFrame
+        if isinstance(records, RecordBuffer):
+            # Already column-wise: straight to Arrow, no per-record objects
+            table = self._buffer_to_table(records)
+        else:
+            df = self._records_to_dataframe(records)
+            df['phase_id'] = df['phase_id'].astype('category')
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{filename_prefix}_{timestamp}.parquet"
+        filepath = os.path.join(self.output_dir, filename)
+
+        # Save to Parquet
+        try:
+            pq.write_table(table, filepath, compression='snappy')
+            logger.debug(f"Saved {table.num_rows} records to: {filepath}")
+            return filepath
+        except Exception as e:
+            logger.error(f"Failed to save records to Parquet: {e}")
+            return None
+
+    @staticmethod
+    def _buffer_to_table(records: RecordBuffer) -> pa.Table:
+        """Convert a column-wise record buffer to an Arrow table."""
+        columns = records.columns()
+        arrays = []
+        for field in RECORD_SCHEMA:
+            column = columns[field.name]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(column, type=field.type.value_type).dictionary_encode())
+            elif isinstance(column, array):
+                # Wrap the packed buffer (zero-copy); pa.array(column) would iterate it element by element
+                arrays.append(pa.array(np.frombuffer(column, dtype=field.type.to_pandas_dtype())))
+            else:
+                arrays.append(pa.array(column, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=RECORD_SCHEMA)
+
+    @staticmethod
+    def _records_to_dataframe(records: List[BenchmarkRecord]) -> pd.DataFrame:
+        """Convert a list of benchmark records to a DataFrame."""
         data = []
         for record in records:
             data.append({
@@ -149,19 +215,4 @@ class ParquetPersistence:
                 'start_ts': record.start_ts,
                 'end_ts': record.end_ts
             })
-
-        df = pd.DataFrame(data)
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{filename_prefix}_{timestamp}.parquet"
-        filepath = os.path.join(self.output_dir, filename)
-
-        # Save to Parquet
-        try:
-            df.to_parquet(filepath, index=False, compression='snappy')
-            logger.debug(f"Saved {len(df)} records to: {filepath}")
-            return filepath
-        except Exception as e:
-            logger.error(f"Failed to save records to Parquet: {e}")
-            return None
+        return pd.DataFrame(data)
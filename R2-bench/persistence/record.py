@@ -3,13 +3,18 @@ Data structures for the R2 benchmark.
 """
 
 import time
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterator, List
 
 
-@dataclass
+@dataclass(slots=True)
 class BenchmarkRecord:
     """Immutable data structure for benchmark records.
 
+    One record is built per request in the download hot path, so the class
+    uses __slots__: no per-instance __dict__ and cheaper attribute access.
+
     Attributes:
         thread_id: ID of the worker thread
         conn_id: ID of the connection
@@ -41,3 +46,72 @@ class BenchmarkRecord:
     phase_id: str = ""
     start_ts: float = field(default_factory=time.time)
     end_ts: float = field(default_factory=time.time)
+
+
+class RecordBuffer:
+    """Column-wise (structure-of-arrays) buffer of benchmark records.
+
+    The download hot path appends one value per column instead of building a
+    BenchmarkRecord per request: numeric columns live unboxed in array.array
+    (8 bytes per value, no per-request objects for the GC to track) and the
+    string columns only hold references to the shared phase/object strings.
+    BenchmarkRecord instances are materialized on demand by iterating.
+
+    Columns carry the BenchmarkRecord field names and order, so the Parquet
+    schema is the same whichever form is written.
+    """
+
+    INT_COLUMNS = ('thread_id', 'conn_id', 'range_start', 'range_len', 'bytes',
+                   'http_status', 'concurrency', 'retry_count')
+    FLOAT_COLUMNS = ('latency_ms', 'rtt_ms', 'start_ts', 'end_ts')
+    STR_COLUMNS = ('object_key', 'phase_id')
+
+    __slots__ = INT_COLUMNS + FLOAT_COLUMNS + STR_COLUMNS
+
+    def __init__(self):
+        for name in self.INT_COLUMNS:
+            setattr(self, name, array('q'))
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, array('d'))
+        for name in self.STR_COLUMNS:
+            setattr(self, name, [])
+
+    def append(self, thread_id: int, conn_id: int, object_key: str, range_start: int,
+               range_len: int, bytes: int, latency_ms: float, rtt_ms: float,
+               http_status: int, concurrency: int, retry_count: int, phase_id: str,
+               start_ts: float, end_ts: float) -> None:
+        """Append one record (same arguments as BenchmarkRecord)."""
+        self.thread_id.append(thread_id)
+        self.conn_id.append(conn_id)
+        self.object_key.append(object_key)
+        self.range_start.append(range_start)
+        self.range_len.append(range_len)
+        self.bytes.append(bytes)
+        self.latency_ms.append(latency_ms)
+        self.rtt_ms.append(rtt_ms)
+        self.http_status.append(http_status)
+        self.concurrency.append(concurrency)
+        self.retry_count.append(retry_count)
+        self.phase_id.append(phase_id)
+        self.start_ts.append(start_ts)
+        self.end_ts.append(end_ts)
+
+    def extend(self, other: "RecordBuffer") -> None:
+        """Append all records of another buffer."""
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def columns(self) -> Dict[str, object]:
+        """Columns by name, in BenchmarkRecord field order."""
+        return {f.name: getattr(self, f.name) for f in fields(BenchmarkRecord)}
+
+    def __len__(self) -> int:
+        return len(self.thread_id)
+
+    def __iter__(self) -> Iterator[BenchmarkRecord]:
+        for values in zip(*self.columns().values()):
+            yield BenchmarkRecord(*values)
+
+    def to_records(self) -> List[BenchmarkRecord]:
+        """Materialize the buffer as BenchmarkRecord instances."""
+        return list(self)
@@ -290,7 +290,8 @@ class ObjectStorageSystem:
         body = None
 
         try:
-            start_time = time.time()
+            # Durations only: monotonic integer ns, immune to wall-clock adjustments
+            start_ns = time.monotonic_ns()
             range_header = f"bytes={start}-{start + length - 1}"
 
             # Add timeout wrapper around entire request
@@ -304,7 +305,7 @@ class ObjectStorageSystem:
             )
 
             # Measure RTT (Time To First Byte) - time until response is received
-            rtt_ms = (time.time() - start_time) * 1000
+            rtt_ms = (time.monotonic_ns() - start_ns) / 1e6
 
             # Read body with timeout
             body = response["Body"]
@@ -314,7 +315,7 @@ class ObjectStorageSystem:
             )
 
             # Total latency includes both RTT and data transfer time
-            latency_ms = (time.time() - start_time) * 1000
+            latency_ms = (time.monotonic_ns() - start_ns) / 1e6
 
             # Validate we got expected amount of data
             if len(data) != length:
@@ -0,0 +1,146 @@
+"""
+Test suite for per-phase colors and legend labels in plots.
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+from visualizations.base import BasePlotter
+from cli.visualiser import BenchmarkVisualizer
+
+
+# First-seen (chronological) order differs from the sorted category order
+PHASES = ['warmup', 'ramp_1', 'ramp_2', 'ramp_3']
+# Distinct request counts, so a segment drawn for the wrong phase shows up
+PHASE_REQUESTS = [3, 1, 2, 4]
+
+
+def make_records(phase_dtype='category') -> pd.DataFrame:
+    """Successful requests per phase, phases in chronological order."""
+    phase_ids = np.repeat(PHASES, PHASE_REQUESTS)
+    start_ts = 1_700_000_000.0 + 10.0 * np.arange(len(phase_ids))
+    return pd.DataFrame({
+        'phase_id': pd.Series(phase_ids).astype(phase_dtype),
+        'start_ts': start_ts,
+        'end_ts': start_ts + 5.0,
+        'bytes': 1000,
+        'latency_ms': 50.0,
+        'http_status': 206,
+        'concurrency': 3,
+    })
+
+
+def assert_phase_lines(plotter: BasePlotter, phase_ids):
+    """Draw phase lines and check labels and colors follow the phases."""
+    fig = BasePlotter.new_figure((6, 4))
+    ax = fig.add_subplot()
+    x = pd.to_datetime(plotter.data['start_ts'].to_numpy(), unit='s')
+    y = np.arange(len(x), dtype=float)
+    plotter.plot_phase_lines(ax, x, y, phase_ids)
+
+    expected_colors = BasePlotter.palette_colors(BasePlotter._SET1, len(PHASES))
+    handles = ax.get_legend().legend_handles
+    assert [h.get_label() for h in handles] == [f'Phase: {p}' for p in PHASES]
+    for handle, color in zip(handles, expected_colors):
+        assert np.allclose(to_rgba(handle.get_color()), color)
+
+    lines = [c for c in ax.collections if isinstance(c, LineCollection)][0]
+    assert np.allclose(lines.get_colors(), expected_colors)
+    # Each segment holds the points of its own phase
+    segments = lines.get_segments()
+    assert len(segments) == len(PHASES)
+    phase_values = np.asarray(phase_ids, dtype=object)
+    for segment, phase in zip(segments, PHASES):
+        assert list(segment[:, 1]) == list(y[phase_values == phase]), phase
+
+
+def test_phase_codes_first_appearance_order():
+    """Test phases come back in first-appearance order for a categorical phase_id."""
+    data = make_records()
+    assert list(data['phase_id'].cat.categories) == sorted(PHASES)
+    with tempfile.TemporaryDirectory() as output_dir:
+        plotter = BasePlotter(data, output_dir)
+        codes, phases = plotter.get_phase_codes()
+        assert list(phases) == PHASES
+        assert list(codes) == list(np.repeat(np.arange(len(PHASES)), PHASE_REQUESTS))
+        assert list(plotter.get_phase_colors()) == PHASES
+
+
+def test_phase_lines_categorical_phase_id():
+    """Test legend labels and segment colors match the phases for a categorical phase_id."""
+    data = make_records()
+    with tempfile.TemporaryDirectory() as output_dir:
+        plotter = BasePlotter(data, output_dir)
+        assert_phase_lines(plotter, data['phase_id'])
+
+
+def test_phase_lines_string_phase_id():
+    """Test legend labels and segment colors match the phases for a string phase_id."""
+    data = make_records(phase_dtype=object)
+    with tempfile.TemporaryDirectory() as output_dir:
+        plotter = BasePlotter(data, output_dir)
+        assert_phase_lines(plotter, data['phase_id'])
+
+
+def test_load_then_plot_categorical_phase_id():
+    """Test a loaded Parquet file keeps phase categories in first-appearance order and plots by it."""
+    # Shuffled rows with sorted categories, as a consolidated file may hold them
+    data = make_records().sample(frac=1.0, random_state=0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_file = os.path.join(tmp_dir, 'benchmark.parquet')
+        data.to_parquet(parquet_file, index=False)
+        visualizer = BenchmarkVisualizer(parquet_file, os.path.join(tmp_dir, 'plots'))
+
+        assert list(visualizer.data['phase_id'].cat.categories) == PHASES
+        assert_phase_lines(visualizer.throughput_plotter, visualizer.data['phase_id'])
+        assert visualizer.create_throughput_timeline() is not None
+        assert visualizer.create_performance_dashboard() is not None
+
+
+def run_tests():
+    """Run all tests."""
+    tests = [
+        ("phase_codes_first_appearance_order", test_phase_codes_first_appearance_order),
+        ("phase_lines_categorical_phase_id", test_phase_lines_categorical_phase_id),
+        ("phase_lines_string_phase_id", test_phase_lines_string_phase_id),
+        ("load_then_plot_categorical_phase_id", test_load_then_plot_categorical_phase_id),
+    ]
+
+    print("=" * 70)
+    print("PHASE PLOTTING TESTS")
+    print("=" * 70 + "\n")
+
+    passed = 0
+    failed = 0
+
+    for name, test_func in tests:
+        try:
+            test_func()
+            print(f"✓ {name}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {name}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {name}: {type(e).__name__}: {e}")
+            failed += 1
+
+    print(f"\n{'=' * 70}")
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 70)
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -4,6 +4,7 @@ Test suite for throughput prorating across phases.
 
 import sys
 import os
+import numpy as np
 import pandas as pd
 
 # Add parent directory to path
@@ -12,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.metrics_utils import (
     get_phase_boundaries,
     calculate_phase_throughput_with_prorating,
+    calculate_all_phase_throughputs,
     prorate_bytes_to_time_windows
 )
 
@@ -160,6 +162,60 @@ def test_prorating_time_windows():
     assert all(abs(row['total_bytes'] - 10.0) < 0.01 for _, row in result.iterrows())
 
 
+def test_prorating_window_start_timestamps():
+    """Test window_start is the datetime form of the raw window_start_ts seconds."""
+    data = pd.DataFrame({
+        'phase_id': ['ramp_1', 'ramp_1'],
+        'start_ts': [1700000000.25, 1700000003.5],
+        'end_ts': [1700000002.75, 1700000006.0],
+        'bytes': [1000, 2000],
+        'http_status': [200, 200]
+    })
+    
+    window_times = [1700000000.0 + i * 0.5 for i in range(14)]
+    result = prorate_bytes_to_time_windows(data, window_times, window_size_seconds=0.5)
+    
+    assert result['window_start_ts'].dtype == np.float64
+    assert list(result['window_start_ts']) == window_times[:6] + window_times[7:12]
+    assert (result['window_start'] == pd.to_datetime(result['window_start_ts'], unit='s')).all()
+
+
+def test_prorating_time_windows_matches_brute_force():
+    """Test the event sweep against a per-window, per-request overlap loop."""
+    rng = np.random.default_rng(7)
+    starts = 1_700_000_000.0 + rng.uniform(0, 60, 200)
+    ends = starts + rng.uniform(0.05, 12, 200)
+    data = pd.DataFrame({
+        'phase_id': ['ramp_1'] * 200,
+        'start_ts': starts,
+        'end_ts': ends,
+        'bytes': rng.integers(1, 100 * 1024 * 1024, 200),
+        'http_status': [200] * 200
+    })
+    
+    window_times = list(range(int(starts.min()), int(ends.max()) + 1))
+    result = prorate_bytes_to_time_windows(data, window_times, window_size_seconds=1.0)
+    
+    expected = {}
+    for window_start in window_times:
+        window_end = window_start + 1.0
+        window_bytes = 0.0
+        window_count = 0
+        for _, request in data.iterrows():
+            overlap = min(request['end_ts'], window_end) - max(request['start_ts'], window_start)
+            if overlap > 0:
+                window_bytes += request['bytes'] * overlap / (request['end_ts'] - request['start_ts'])
+                window_count += 1
+        if window_count > 0:
+            expected[window_start] = (window_bytes, window_count)
+    
+    assert len(result) == len(expected)
+    for _, row in result.iterrows():
+        window_bytes, window_count = expected[int(row['window_start_ts'])]
+        assert abs(row['total_bytes'] - window_bytes) <= 1e-6 * window_bytes + 1e-3
+        assert row['request_count'] == window_count
+
+
 def test_multiple_requests_same_phase():
     """Test prorating with multiple requests in the same phase."""
     data = pd.DataFrame({
@@ -199,6 +255,28 @@ def test_request_partially_overlapping_phase():
     assert abs(result['total_bytes'] - 500.0) < 0.01
 
 
+def test_all_phase_throughputs_match_per_phase():
+    """Test the single-pass all-phase throughput against the per-phase function."""
+    data = pd.DataFrame({
+        'phase_id': ['ramp_1', 'ramp_1', 'ramp_2', 'ramp_2', 'ramp_3'],
+        'start_ts': [100.0, 150.0, 190.0, 260.0, 290.0],
+        'end_ts': [200.0, 210.0, 280.0, 260.0, 400.0],
+        'bytes': [1000, 2000, 3000, 4000, 5000],
+        'http_status': [200, 200, 200, 200, 200]
+    })
+    
+    boundaries = get_phase_boundaries(data)
+    results = calculate_all_phase_throughputs(data, boundaries)
+    
+    assert list(results.keys()) == ['ramp_1', 'ramp_2', 'ramp_3']
+    for phase_id, result in results.items():
+        expected = calculate_phase_throughput_with_prorating(data, phase_id, boundaries)
+        assert result['request_count'] == expected['request_count']
+        assert abs(result['total_bytes'] - expected['total_bytes']) < 0.01
+        assert abs(result['throughput_gbps'] - expected['throughput_gbps']) < 1e-12
+        assert result['duration_seconds'] == expected['duration_seconds']
+
+
 def run_tests():
     """Run all tests."""
     tests = [
@@ -207,8 +285,11 @@ def run_tests():
         ("prorating_across_two_phases", test_prorating_across_two_phases),
         ("prorating_across_three_phases", test_prorating_across_three_phases),
         ("prorating_time_windows", test_prorating_time_windows),
+        ("prorating_window_start_timestamps", test_prorating_window_start_timestamps),
+        ("prorating_time_windows_matches_brute_force", test_prorating_time_windows_matches_brute_force),
         ("multiple_requests_same_phase", test_multiple_requests_same_phase),
         ("request_partially_overlapping_phase", test_request_partially_overlapping_phase),
+        ("all_phase_throughputs_match_per_phase", test_all_phase_throughputs_match_per_phase),
     ]
     
     print("=" * 70)
@@ -2,38 +2,290 @@
 Base classes for plot visualization.
 """
 
+import io
+import matplotlib
+import matplotlib.dates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import numpy as np
 import pandas as pd
 import logging
+import os
 
-from common.metrics_utils import successful_request_mask
+from common.metrics_utils import build_overlap_index, get_phase_boundaries, successful_request_mask
+from configuration import PLOT_DPI, PLOT_FORMAT
 
 logger = logging.getLogger(__name__)
 
 
 class BasePlotter:
     """Base class for all plotters with common functionality."""
+
+    # Qualitative palettes as RGBA arrays, resolved once instead of calling the
+    # colormap (and re-normalising) on every plot
+    _SET1 = matplotlib.colors.to_rgba_array(matplotlib.colormaps['Set1'].colors)
+    _SET2 = matplotlib.colors.to_rgba_array(matplotlib.colormaps['Set2'].colors)
+    _SET3 = matplotlib.colors.to_rgba_array(matplotlib.colormaps['Set3'].colors)
     
-    def __init__(self, data: pd.DataFrame, output_dir: str, data_source: str = None):
+    def __init__(self, data: pd.DataFrame, output_dir: str, data_source: str = None,
+                 plot_format: str = None, cache: dict = None):
+        """Initialize the plotter.
+
+        Args:
+            data: Request records to plot
+            output_dir: Directory the plots and tables are written to
+            data_source: Label of the data (e.g. the Parquet file name)
+            plot_format: Image format; defaults to PLOT_FORMAT
+            cache: Dict of derived data (filtered rows, arrays, phase boundaries).
+                Plotters built on the same frame can pass the same dict so each
+                intermediate is computed once for all of them.
+        """
         self.data = data
         self.output_dir = output_dir
         self.data_source = data_source or "unknown"
+        self._cache = {} if cache is None else cache
+        self.dpi = PLOT_DPI
+        self.plot_format = plot_format or PLOT_FORMAT
+        # No bbox_inches='tight': it costs an extra render pass per figure and
+        # every plot already lays itself out (tight_layout / gridspec spacing)
+        self.save_kwargs = dict(dpi=self.dpi, bbox_inches=None)
     
     def filter_successful_requests(self):
-        """Filter data to only include successful requests."""
+        """Filter data to only include successful requests.
+
+        The filtered frame is cached, so callers must not modify it in place.
+        """
         if self.data is None or len(self.data) == 0:
             return None
-        return self.data[successful_request_mask(self.data)]
+        if 'successful_data' not in self._cache:
+            self._cache['successful_data'] = self.data[successful_request_mask(self.data)]
+        return self._cache['successful_data']
     
+    def warm_caches(self):
+        """Compute the intermediates several plots share, before plots run concurrently.
+
+        Each cache is otherwise filled lazily by whichever plot asks first, so
+        plots started together on a thread pool would all compute it.
+        """
+        if self.filter_successful_requests() is None:
+            return
+        self.get_successful_arrays()
+        self.get_latency_quantiles()
+        self.get_phase_color_array()
+        self.get_phase_boundaries()
+        self.get_phase_boundaries(successful_only=True)
+        self.get_overlap_index()
+
+    def get_successful_arrays(self):
+        """Latency and concurrency of successful requests as cached NumPy arrays.
+
+        Returns:
+            Tuple (latency_ms, concurrency), or (None, None) without successful requests
+        """
+        if 'successful_arrays' not in self._cache:
+            successful_data = self.filter_successful_requests()
+            if successful_data is None or len(successful_data) == 0:
+                return None, None
+            self._cache['successful_arrays'] = (
+                successful_data['latency_ms'].to_numpy(),
+                successful_data['concurrency'].to_numpy(),
+            )
+        return self._cache['successful_arrays']
+
+    def get_concurrency_levels(self):
+        """Sorted concurrency levels seen among successful requests."""
+        if 'concurrency_levels' not in self._cache:
+            _, concurrency = self.get_successful_arrays()
+            if concurrency is None:
+                return []
+            self._cache['concurrency_levels'] = np.unique(concurrency).tolist()
+        return self._cache['concurrency_levels']
+
+    def get_latency_by_concurrency(self):
+        """Successful-request latencies split per concurrency level (in level order).
+
+        One stable sort by concurrency replaces a boolean mask per level.
+        """
+        if 'latency_by_concurrency' not in self._cache:
+            latency, concurrency = self.get_successful_arrays()
+            if latency is None:
+                return []
+            order = np.argsort(concurrency, kind='stable')
+            sorted_concurrency = concurrency[order]
+            splits = np.flatnonzero(np.diff(sorted_concurrency)) + 1
+            self._cache['latency_by_concurrency'] = np.split(latency[order], splits)
+        return self._cache['latency_by_concurrency']
+
+    def get_latency_quantiles(self):
+        """P50, P95 and P99 latency (ms) of successful requests, from one partition pass."""
+        if 'latency_quantiles' not in self._cache:
+            latency, _ = self.get_successful_arrays()
+            if latency is None:
+                return None
+            self._cache['latency_quantiles'] = np.percentile(latency, [50, 95, 99])
+        return self._cache['latency_quantiles']
+
+    def get_request_times(self):
+        """Start times of successful requests as datetimes, converted once."""
+        if 'request_times' not in self._cache:
+            successful_data = self.filter_successful_requests()
+            if successful_data is None or len(successful_data) == 0:
+                return None
+            self._cache['request_times'] = pd.to_datetime(successful_data['start_ts'].to_numpy(), unit='s')
+        return self._cache['request_times']
+
+    def get_latency_stats(self):
+        """Avg/p50/p95/p99 latency from the cached arrays (same keys as calculate_latency_stats)."""
+        latency, _ = self.get_successful_arrays()
+        if latency is None:
+            return {'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        p50, p95, p99 = self.get_latency_quantiles()
+        return {'avg': latency.mean(), 'p50': p50, 'p95': p95, 'p99': p99}
+
+    def get_phase_codes(self):
+        """Integer phase code per row of data, and the phases those codes index.
+
+        Phases are a plain array in order of first appearance (as
+        Series.unique()), so the codes can index per-phase arrays such as a
+        color palette directly. For a categorical phase_id, factorize returns
+        a CategoricalIndex that carries the category order as well; it is
+        unwrapped so callers never pick up that order instead.
+        """
+        if self.data is None or len(self.data) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=object)
+        if 'phase_codes' not in self._cache:
+            codes, uniques = pd.factorize(self.data['phase_id'])
+            self._cache['phase_codes'] = (codes, np.asarray(uniques, dtype=object))
+        return self._cache['phase_codes']
+
+    def get_phase_boundaries(self, successful_only: bool = False) -> dict:
+        """Phase boundaries of all rows (or only successful ones), computed once."""
+        key = ('phase_boundaries', successful_only)
+        if key not in self._cache:
+            data = self.filter_successful_requests() if successful_only else self.data
+            if data is None or len(data) == 0:
+                return {}
+            self._cache[key] = get_phase_boundaries(data)
+        return self._cache[key]
+
+    def get_overlap_index(self):
+        """Sorted events and prefix sums of successful requests, shared by every window timeline."""
+        if 'overlap_index' not in self._cache:
+            successful_data = self.filter_successful_requests()
+            if successful_data is None or len(successful_data) == 0:
+                return None
+            self._cache['overlap_index'] = build_overlap_index(
+                successful_data['start_ts'].to_numpy(dtype=float),
+                successful_data['end_ts'].to_numpy(dtype=float),
+                successful_data['bytes'].to_numpy(dtype=float),
+            )
+        return self._cache['overlap_index']
+
     def get_unique_phases(self):
         """Get unique phase IDs from data."""
-        if self.data is None or len(self.data) == 0:
-            return []
-        return self.data['phase_id'].unique()
+        return self.get_phase_codes()[1]
     
+    @staticmethod
+    def palette_colors(palette: np.ndarray, count: int) -> np.ndarray:
+        """First `count` colors of a palette; indices past its end reuse the last color."""
+        return palette[np.minimum(np.arange(count), len(palette) - 1)]
+    
+    def get_phase_color_array(self) -> np.ndarray:
+        """RGBA color per phase, indexed by the codes from get_phase_codes()."""
+        if 'phase_colors' not in self._cache:
+            self._cache['phase_colors'] = self.palette_colors(self._SET1, len(self.get_unique_phases()))
+        return self._cache['phase_colors']
+
     def get_phase_colors(self):
         """Generate color map for phases."""
-        import matplotlib.pyplot as plt
-        phases = self.get_unique_phases()
-        phase_colors = plt.cm.Set1(range(len(phases)))
-        return dict(zip(phases, phase_colors))
+        if 'phase_color_map' not in self._cache:
+            self._cache['phase_color_map'] = dict(zip(self.get_unique_phases(), self.get_phase_color_array()))
+        return self._cache['phase_color_map']
+
+    def plot_phase_lines(self, ax, x, y, phase_ids, marker='o', linewidth=2, markersize=4, alpha=1.0):
+        """Draw one line per phase as a single LineCollection plus one marker scatter.
+
+        Equivalent to an ax.plot() call per phase, but adds two artists to the
+        axes regardless of how many phases there are.
+
+        Args:
+            ax: Axes to draw on
+            x: Datetime-like x values (e.g. window starts)
+            y: Y values
+            phase_ids: Phase of each point
+        """
+        phases = np.asarray(self.get_unique_phases(), dtype=object)
+        # Encode plain values against plain categories: anything categorical
+        # would number the phases by its category order (sorted), not by the
+        # first-appearance order the colors and labels are indexed by
+        codes = np.asarray(pd.Categorical(np.asarray(phase_ids, dtype=object), categories=phases).codes)
+        points = np.column_stack([
+            matplotlib.dates.date2num(np.asarray(x, dtype='datetime64[ns]')),
+            np.asarray(y, dtype=float),
+        ])
+
+        # Group points by phase, keeping time order inside each phase
+        order = np.argsort(codes, kind='stable')
+        points, codes = points[order], codes[order]
+        keep = codes >= 0
+        points, codes = points[keep], codes[keep]
+        if len(points) == 0:
+            return
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        segment_codes = codes[np.r_[0, bounds]]
+
+        phase_colors = self.get_phase_color_array()
+        ax.add_collection(LineCollection(
+            np.split(points, bounds), colors=phase_colors[segment_codes],
+            linewidths=linewidth, alpha=alpha,
+        ))
+        ax.scatter(points[:, 0], points[:, 1], c=phase_colors[codes], marker=marker,
+                   s=markersize ** 2, alpha=alpha, zorder=2.5)
+        ax.xaxis_date()
+        ax.autoscale_view()
+
+        ax.legend(handles=[
+            Line2D([], [], color=phase_colors[code], marker=marker, linewidth=linewidth,
+                   markersize=markersize, alpha=alpha, label=f'Phase: {phases[code]}')
+            for code in segment_codes
+        ])
+
+    @staticmethod
+    def new_figure(figsize, layout='tight') -> Figure:
+        """Create a standalone Figure, outside pyplot's global figure registry.
+
+        The figure is attached to an Agg canvas up front, so saving it renders
+        directly instead of resolving a backend and swapping canvases.
+
+        Args:
+            figsize: Figure size in inches
+            layout: Layout engine applied on draw ('tight' replaces tight_layout() calls)
+        """
+        fig = Figure(figsize=figsize, layout=layout)
+        FigureCanvasAgg(fig)
+        return fig
+
+    def save_figure(self, fig: Figure, name: str) -> str:
+        """Save a figure into the output directory.
+
+        Args:
+            fig: Figure to render
+            name: File name without extension; the extension follows plot_format
+
+        Returns:
+            Path of the written file
+        """
+        output_file = os.path.join(self.output_dir, f'{name}.{self.plot_format}')
+        # Encode in memory, then hand the file to the OS in one write
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=self.plot_format, **self.save_kwargs)
+        self._write_file(output_file, buffer.getbuffer())
+        return output_file
 
+    @staticmethod
+    def _write_file(path: str, payload: memoryview):
+        """Write an encoded plot to disk in one call."""
+        with open(path, 'wb') as f:
+            f.write(payload)
@@ -3,17 +3,16 @@ Dashboard and summary report visualizations.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import logging
 import os
 
 from .base import BasePlotter
 from common.metrics_utils import (
     prorate_bytes_to_time_windows,
-    calculate_phase_throughput_with_prorating,
-    get_phase_boundaries,
+    build_window_starts,
+    calculate_all_phase_throughputs,
     calculate_throughput_gbps,
-    calculate_latency_stats,
     bytes_to_gb,
     successful_request_mask,
     compute_retry_error_statistics,
@@ -55,7 +54,7 @@ class DashboardPlotter(BasePlotter):
             # Calculate latency statistics using shared utility
             successful_data = self.filter_successful_requests()
             if successful_data is not None and len(successful_data) > 0:
-                latency_stats = calculate_latency_stats(successful_data, latency_col='latency_ms')
+                latency_stats = self.get_latency_stats()
                 avg_latency = latency_stats['avg']
                 p50_latency = latency_stats['p50']
                 p95_latency = latency_stats['p95']
@@ -83,7 +82,7 @@ Latency Statistics (ms):
   P95: {p95_latency:.1f}
   P99: {p99_latency:.1f}
 
-Concurrency Levels: {sorted(data['concurrency'].unique())}
+Concurrency Levels: {sorted(data['concurrency'].unique().tolist())}
 
 Retries / HTTP attempts
   Sum of retry_count (failed attempts before outcome): {retry_stats['total_failed_http_attempts']:,}
@@ -105,7 +104,11 @@ Retries / HTTP attempts
             return None
     
     def create_performance_dashboard(self):
-        """Create a comprehensive performance dashboard."""
+        """Create a comprehensive performance dashboard.
+
+        Each panel is drawn by its own helper with its own guard, so a failure
+        in one panel leaves the remaining panels in the saved dashboard.
+        """
         if self.data is None or len(self.data) == 0:
             logger.warning("No data available for performance dashboard")
             return None
@@ -117,183 +120,202 @@ Retries / HTTP attempts
                 logger.warning("No successful requests for performance dashboard")
                 return None
 
+            # Shared intermediates, computed once for all panels
             data = ensure_retry_count_column(self.data)
             retry_stats = compute_retry_error_statistics(data)
+            latency_stats = self.get_latency_stats()
 
             # Create large dashboard
-            fig = plt.figure(figsize=(20, 16))
+            fig = self.new_figure((20, 16), layout=None)
             gs = fig.add_gridspec(4, 4, hspace=0.3, wspace=0.3)
             fig.suptitle('R2 Benchmark Performance Dashboard', fontsize=20, fontweight='bold')
             
-            # 1. Throughput timeline (top row, spans 2 columns) - using prorated 30s windows
-            ax1 = fig.add_subplot(gs[0, :2])
-            # Use start_ts/end_ts for time range
-            start_time = self.data['start_ts'].min()
-            end_time = self.data['end_ts'].max()
-            
-            # Generate windows using configured window size
-            window_size = THROUGHPUT_WINDOW_SIZE_SECONDS
-            window_start_times = []
-            current_time = start_time
-            while current_time <= end_time:
-                window_start_times.append(current_time)
-                current_time += window_size
-            
-            # Use prorating utility
-            throughput_data = prorate_bytes_to_time_windows(
-                self.data,
-                window_start_times,
-                window_size_seconds=window_size,
-                start_col='start_ts',
-                end_col='end_ts'
-            )
-            
-            phase_color_map = self.get_phase_colors()
-            phases = self.get_unique_phases()
-            
-            for phase in phases:
-                phase_data = throughput_data[throughput_data['phase_id'] == phase]
-                if len(phase_data) > 0:
-                    ax1.plot(phase_data['window_start'], phase_data['throughput_gbps'], 
-                            marker='o', linewidth=2, markersize=4, 
-                            color=phase_color_map[phase], label=f'Phase: {phase}')
-            
-            ax1.set_title('Throughput Timeline', fontsize=14)
-            ax1.set_ylabel('Throughput (Gbps)')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
-            
-            # 2. Latency distribution (top right)
-            ax2 = fig.add_subplot(gs[0, 2:])
-            ax2.hist(successful_data['latency_ms'], bins=30, alpha=0.7, edgecolor='black', color='skyblue')
-            ax2.set_title('Latency Distribution', fontsize=14)
-            ax2.set_xlabel('Latency (ms)')
-            ax2.set_ylabel('Frequency')
-            ax2.grid(True, alpha=0.3)
-            
-            # 3. Concurrency vs Throughput (second row, left)
-            ax3 = fig.add_subplot(gs[1, :2])
-            concurrency_stats = successful_data.groupby('concurrency').agg({
-                'bytes': 'sum',
-                'start_ts': 'min',
-                'end_ts': 'max'
-            }).reset_index()
-            concurrency_stats.columns = ['concurrency', 'total_bytes', 'start_time', 'end_time']
-            
-            concurrency_stats['duration_seconds'] = concurrency_stats['end_time'] - concurrency_stats['start_time']
-            # Calculate throughput in gigabits per second (Gbps)
-            concurrency_stats['throughput_gbps'] = concurrency_stats.apply(
-                lambda row: calculate_throughput_gbps(row['total_bytes'], row['duration_seconds']), axis=1
-            )
-            
-            ax3.plot(concurrency_stats['concurrency'], concurrency_stats['throughput_gbps'], 
-                    marker='o', linewidth=2, markersize=8, color='blue')
-            ax3.set_title('Throughput vs Concurrency', fontsize=14)
-            ax3.set_xlabel('Concurrency Level')
-            ax3.set_ylabel('Throughput (Gbps)')
-            ax3.grid(True, alpha=0.3)
-            
-            # 4. Error rate (second row, right)
-            ax4 = fig.add_subplot(gs[1, 2:])
-            total_requests = len(self.data)
-            successful_requests = len(successful_data)
-            error_requests = total_requests - successful_requests
-            error_rate = error_requests / total_requests if total_requests > 0 else 0
-            
-            ax4.bar(['Successful', 'Failed'], [successful_requests, error_requests], 
-                   color=['green', 'red'], alpha=0.7)
-            ax4.set_title(f'Request Success Rate: {successful_requests/total_requests*100:.1f}%', fontsize=14)
-            ax4.set_ylabel('Number of Requests')
-            ax4.grid(True, alpha=0.3)
-            
-            # 5. Latency percentiles (third row, left)
-            ax5 = fig.add_subplot(gs[2, :2])
-            percentiles = [50, 90, 95, 99]
-            # Use shared utility for latency percentiles
-            latency_stats = calculate_latency_stats(successful_data, latency_col='latency_ms')
-            latency_percentiles = [
-                latency_stats['p50'] if p == 50 else
-                latency_stats['p95'] if p == 95 else
-                latency_stats['p99'] if p == 99 else
-                successful_data['latency_ms'].quantile(p/100)
-                for p in percentiles
+            panels = [
+                ('throughput timeline', self._panel_throughput_timeline,
+                 fig.add_subplot(gs[0, :2]), ()),
+                ('latency distribution', self._panel_latency_distribution,
+                 fig.add_subplot(gs[0, 2:]), ()),
+                ('throughput vs concurrency', self._panel_throughput_vs_concurrency,
+                 fig.add_subplot(gs[1, :2]), (successful_data,)),
+                ('success rate', self._panel_success_rate,
+                 fig.add_subplot(gs[1, 2:]), (successful_data,)),
+                ('latency percentiles', self._panel_latency_percentiles,
+                 fig.add_subplot(gs[2, :2]), (latency_stats,)),
+                ('throughput by phase', self._panel_phase_throughput,
+                 fig.add_subplot(gs[2, 2:]), (successful_data,)),
+                ('key metrics', self._panel_key_metrics,
+                 fig.add_subplot(gs[3, :]), (data, successful_data, latency_stats, retry_stats)),
             ]
-            ax5.bar([f'P{p}' for p in percentiles], latency_percentiles, 
-                   color=['blue', 'orange', 'red', 'darkred'], alpha=0.7)
-            ax5.set_title('Latency Percentiles', fontsize=14)
-            ax5.set_ylabel('Latency (ms)')
-            ax5.grid(True, alpha=0.3)
-            
-            # 6. Phase summary (third row, right) - using prorating
-            ax6 = fig.add_subplot(gs[2, 2:])
-            phase_boundaries = get_phase_boundaries(successful_data)
-            phase_summary_list = []
-            for phase_id in successful_data['phase_id'].unique():
-                phase_result = calculate_phase_throughput_with_prorating(
-                    successful_data,  # Pass all data for proper prorating
-                    phase_id=phase_id,
-                    phase_boundaries=phase_boundaries
-                )
-                phase_result['phase_id'] = phase_id
-                # Get latency from requests that started in this phase
-                phase_data = successful_data[successful_data['phase_id'] == phase_id]
-                # Use shared utility for latency stats
-                phase_latency_stats = calculate_latency_stats(phase_data, latency_col='latency_ms')
-                phase_result['avg_latency'] = phase_latency_stats['avg']
-                phase_summary_list.append(phase_result)
-            
-            phase_summary = pd.DataFrame(phase_summary_list)
-            
-            ax6.bar(phase_summary['phase_id'], phase_summary['throughput_gbps'], 
-                   color=plt.cm.Set3(range(len(phase_summary))), alpha=0.7)
-            ax6.set_title('Throughput by Phase', fontsize=14)
-            ax6.set_ylabel('Throughput (Gbps)')
-            ax6.tick_params(axis='x', rotation=45)
-            ax6.grid(True, alpha=0.3)
-            
-            # 7. Key metrics summary (bottom row, full width)
-            ax7 = fig.add_subplot(gs[3, :])
-            ax7.axis('off')
-            
-            # Calculate key metrics using start_ts/end_ts
-            total_duration = self.data['end_ts'].max() - self.data['start_ts'].min()
-            total_bytes = successful_data['bytes'].sum()
-            # Calculate throughput in gigabits per second (Gbps)
-            avg_throughput = calculate_throughput_gbps(total_bytes, total_duration)
-            # Use shared utility for latency stats
-            overall_latency_stats = calculate_latency_stats(successful_data, latency_col='latency_ms')
-            avg_latency = overall_latency_stats['avg']
-            p95_latency = overall_latency_stats['p95']
-            p99_latency = overall_latency_stats['p99']
-            
-            metrics_text = f"""
-            KEY PERFORMANCE METRICS
-            ========================
-            Total Duration: {total_duration/3600:.2f} hours
-            Total Data Transferred: {bytes_to_gb(total_bytes):.2f} GB
-            Average Throughput: {avg_throughput:.2f} Gbps
-            Average Latency: {avg_latency:.1f} ms
-            P95 Latency: {p95_latency:.1f} ms
-            P99 Latency: {p99_latency:.1f} ms
-            Success Rate: {successful_requests/total_requests*100:.2f}%
-            Concurrency Levels: {sorted(data['concurrency'].unique())}
-            Sum retry_count (failed HTTP attempts): {retry_stats['total_failed_http_attempts']:,}
-            Successful w/ >=1 retry: {retry_stats['successful_after_retry']:,}
-            Approx HTTP round-trips: {retry_stats['total_http_round_trips_approx']:,}
-            """
-            
-            ax7.text(0.1, 0.5, metrics_text, fontsize=12, verticalalignment='center',
-                    bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.8))
+            drawn = sum(
+                self._draw_panel(name, panel, ax, *args) for name, panel, ax, args in panels
+            )
+            if drawn == 0:
+                logger.error("Failed to create performance dashboard: no panel could be drawn")
+                return None
             
             # Save plot
-            output_file = os.path.join(self.output_dir, 'performance_dashboard.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'performance_dashboard')
             
-            logger.info(f"Created performance dashboard: {output_file}")
+            logger.info(f"Created performance dashboard: {output_file} ({drawn}/{len(panels)} panels)")
             return output_file
             
         except Exception as e:
             logger.error(f"Failed to create performance dashboard: {e}")
             return None
 
+    def _draw_panel(self, name, panel, ax, *args) -> bool:
+        """Draw one dashboard panel, leaving it blank if it fails."""
+        try:
+            return panel(ax, *args)
+        except Exception as e:
+            logger.warning(f"Skipping dashboard panel '{name}': {e}")
+            ax.clear()
+            ax.axis('off')
+            ax.set_title(f'{name} (unavailable)', fontsize=14)
+            return False
+
+    def _panel_throughput_timeline(self, ax) -> bool:
+        """Throughput timeline using prorated windows."""
+        # Use start_ts/end_ts for time range
+        start_time = self.data['start_ts'].min()
+        end_time = self.data['end_ts'].max()
+        
+        # Generate windows using configured window size
+        window_size = THROUGHPUT_WINDOW_SIZE_SECONDS
+        window_start_times = build_window_starts(start_time, end_time, window_size)
+        
+        # Use prorating utility
+        throughput_data = prorate_bytes_to_time_windows(
+            self.data,
+            window_start_times,
+            window_size_seconds=window_size,
+            start_col='start_ts',
+            end_col='end_ts',
+            phase_boundaries=self.get_phase_boundaries(),
+            overlap_index=self.get_overlap_index()
+        )
+        
+        self.plot_phase_lines(ax, throughput_data['window_start'], throughput_data['throughput_gbps'],
+                              throughput_data['phase_id'], marker='o', linewidth=2, markersize=4)
+        
+        ax.set_title('Throughput Timeline', fontsize=14)
+        ax.set_ylabel('Throughput (Gbps)')
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_latency_distribution(self, ax) -> bool:
+        """Histogram of successful request latencies."""
+        ax.hist(self.get_successful_arrays()[0], bins=30, alpha=0.7, edgecolor='black', color='skyblue')
+        ax.set_title('Latency Distribution', fontsize=14)
+        ax.set_xlabel('Latency (ms)')
+        ax.set_ylabel('Frequency')
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_throughput_vs_concurrency(self, ax, successful_data) -> bool:
+        """Throughput per concurrency level."""
+        concurrency_stats = successful_data.groupby('concurrency').agg(
+            total_bytes=('bytes', 'sum'),
+            start_time=('start_ts', 'min'),
+            end_time=('end_ts', 'max'),
+        ).reset_index()
+        
+        concurrency_stats['duration_seconds'] = concurrency_stats['end_time'] - concurrency_stats['start_time']
+        # Calculate throughput in gigabits per second (Gbps)
+        concurrency_stats['throughput_gbps'] = concurrency_stats.apply(
+            lambda row: calculate_throughput_gbps(row['total_bytes'], row['duration_seconds']), axis=1
+        )
+        
+        ax.plot(concurrency_stats['concurrency'], concurrency_stats['throughput_gbps'], 
+                marker='o', linewidth=2, markersize=8, color='blue')
+        ax.set_title('Throughput vs Concurrency', fontsize=14)
+        ax.set_xlabel('Concurrency Level')
+        ax.set_ylabel('Throughput (Gbps)')
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_success_rate(self, ax, successful_data) -> bool:
+        """Successful vs failed request counts."""
+        total_requests = len(self.data)
+        successful_requests = len(successful_data)
+        error_requests = total_requests - successful_requests
+        
+        ax.bar(['Successful', 'Failed'], [successful_requests, error_requests], 
+               color=['green', 'red'], alpha=0.7)
+        ax.set_title(f'Request Success Rate: {successful_requests/total_requests*100:.1f}%', fontsize=14)
+        ax.set_ylabel('Number of Requests')
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_latency_percentiles(self, ax, latency_stats) -> bool:
+        """Latency percentile bars."""
+        percentiles = [50, 90, 95, 99]
+        latency, _ = self.get_successful_arrays()
+        # P50/P95/P99 are cached; only P90 needs its own pass
+        latency_percentiles = [
+            latency_stats['p50'],
+            np.percentile(latency, 90),
+            latency_stats['p95'],
+            latency_stats['p99'],
+        ]
+        ax.bar([f'P{p}' for p in percentiles], latency_percentiles, 
+               color=['blue', 'orange', 'red', 'darkred'], alpha=0.7)
+        ax.set_title('Latency Percentiles', fontsize=14)
+        ax.set_ylabel('Latency (ms)')
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_phase_throughput(self, ax, successful_data) -> bool:
+        """Prorated throughput per phase."""
+        phase_boundaries = self.get_phase_boundaries(successful_only=True)
+        # All phases in one pass, each prorated over all overlapping requests
+        phase_throughputs = calculate_all_phase_throughputs(successful_data, phase_boundaries)
+        phase_summary_list = []
+        for phase_id, phase_result in phase_throughputs.items():
+            phase_result['phase_id'] = phase_id
+            phase_summary_list.append(phase_result)
+        
+        phase_summary = pd.DataFrame(phase_summary_list)
+        
+        ax.bar(phase_summary['phase_id'], phase_summary['throughput_gbps'], 
+               color=self.palette_colors(self._SET3, len(phase_summary)), alpha=0.7)
+        ax.set_title('Throughput by Phase', fontsize=14)
+        ax.set_ylabel('Throughput (Gbps)')
+        ax.tick_params(axis='x', rotation=45)
+        ax.grid(True, alpha=0.3)
+        return True
+
+    def _panel_key_metrics(self, ax, data, successful_data, latency_stats, retry_stats) -> bool:
+        """Text box with the headline metrics."""
+        ax.axis('off')
+        
+        # Calculate key metrics using start_ts/end_ts
+        total_requests = len(self.data)
+        successful_requests = len(successful_data)
+        total_duration = self.data['end_ts'].max() - self.data['start_ts'].min()
+        total_bytes = successful_data['bytes'].sum()
+        # Calculate throughput in gigabits per second (Gbps)
+        avg_throughput = calculate_throughput_gbps(total_bytes, total_duration)
+        avg_latency = latency_stats['avg']
+        p95_latency = latency_stats['p95']
+        p99_latency = latency_stats['p99']
+        
+        metrics_text = f"""
+        KEY PERFORMANCE METRICS
+        ========================
+        Total Duration: {total_duration/3600:.2f} hours
+        Total Data Transferred: {bytes_to_gb(total_bytes):.2f} GB
+        Average Throughput: {avg_throughput:.2f} Gbps
+        Average Latency: {avg_latency:.1f} ms
+        P95 Latency: {p95_latency:.1f} ms
+        P99 Latency: {p99_latency:.1f} ms
+        Success Rate: {successful_requests/total_requests*100:.2f}%
+        Concurrency Levels: {sorted(data['concurrency'].unique().tolist())}
+        Sum retry_count (failed HTTP attempts): {retry_stats['total_failed_http_attempts']:,}
+        Successful w/ >=1 retry: {retry_stats['successful_after_retry']:,}
+        Approx HTTP round-trips: {retry_stats['total_http_round_trips_approx']:,}
+        """
+        
+        ax.text(0.1, 0.5, metrics_text, fontsize=12, verticalalignment='center',
+                bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.8))
+        return True
@@ -3,7 +3,7 @@ Latency visualization plots.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 import numpy as np
 import logging
 import os
@@ -19,6 +19,14 @@ from common.metrics_utils import (
 logger = logging.getLogger(__name__)
 
 
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` values; shorter windows at the start (min_periods=1)."""
+    cumulative = np.cumsum(values, dtype=float)
+    averages = cumulative.copy()
+    averages[window:] = cumulative[window:] - cumulative[:-window]
+    return averages / np.minimum(np.arange(1, len(values) + 1), window)
+
+
 class LatencyPlotter(BasePlotter):
     """Plotter for latency-related visualizations."""
     
@@ -29,22 +37,23 @@ class LatencyPlotter(BasePlotter):
             return None
         
         try:
-            successful_data = self.filter_successful_requests()
+            latency, _ = self.get_successful_arrays()
             
-            if successful_data is None or len(successful_data) == 0:
+            if latency is None:
                 logger.warning("No successful requests for latency histogram")
                 return None
             
             # Get unique concurrency levels
-            concurrency_levels = sorted(successful_data['concurrency'].unique())
+            concurrency_levels = self.get_concurrency_levels()
             
             # Create subplot layout
-            fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+            fig = self.new_figure((16, 12))
+            axes = fig.subplots(2, 2)
             fig.suptitle('Comprehensive Latency Analysis', fontsize=16, fontweight='bold')
             
             # 1. Overall histogram
             ax1 = axes[0, 0]
-            ax1.hist(successful_data['latency_ms'], bins=50, alpha=0.7, edgecolor='black', color='skyblue')
+            ax1.hist(latency, bins=50, alpha=0.7, edgecolor='black', color='skyblue')
             ax1.set_title('Overall Latency Distribution', fontsize=12)
             ax1.set_xlabel('Latency (ms)')
             ax1.set_ylabel('Frequency')
@@ -52,7 +61,7 @@ class LatencyPlotter(BasePlotter):
             
             # 2. Log-scale histogram for better visibility
             ax2 = axes[0, 1]
-            ax2.hist(successful_data['latency_ms'], bins=50, alpha=0.7, edgecolor='black', color='lightcoral')
+            ax2.hist(latency, bins=50, alpha=0.7, edgecolor='black', color='lightcoral')
             ax2.set_yscale('log')
             ax2.set_title('Latency Distribution (Log Scale)', fontsize=12)
             ax2.set_xlabel('Latency (ms)')
@@ -61,7 +70,7 @@ class LatencyPlotter(BasePlotter):
             
             # 3. CDF plot
             ax3 = axes[1, 0]
-            sorted_latencies = np.sort(successful_data['latency_ms'])
+            sorted_latencies = np.sort(latency)
             y = np.arange(1, len(sorted_latencies) + 1) / len(sorted_latencies)
             ax3.plot(sorted_latencies, y, linewidth=2, color='green')
             ax3.set_title('Cumulative Distribution Function', fontsize=12)
@@ -72,15 +81,15 @@ class LatencyPlotter(BasePlotter):
             # 4. Latency by concurrency (if multiple levels)
             ax4 = axes[1, 1]
             if len(concurrency_levels) > 1:
-                for i, concurrency in enumerate(concurrency_levels):
-                    c_data = successful_data[successful_data['concurrency'] == concurrency]['latency_ms']
+                latency_by_concurrency = self.get_latency_by_concurrency()
+                for i, (concurrency, c_data) in enumerate(zip(concurrency_levels, latency_by_concurrency)):
                     ax4.hist(c_data, bins=20, alpha=0.6, label=f'Concurrency {concurrency}', 
-                            color=plt.cm.Set1(i))
+                            color=self._SET1[min(i, len(self._SET1) - 1)])
                 ax4.set_title('Latency Distribution by Concurrency', fontsize=12)
                 ax4.legend()
             else:
                 # Single concurrency - show density plot
-                ax4.hist(successful_data['latency_ms'], bins=50, alpha=0.7, density=True, 
+                ax4.hist(latency, bins=50, alpha=0.7, density=True, 
                         edgecolor='black', color='purple')
                 ax4.set_title('Latency Density Distribution', fontsize=12)
             ax4.set_xlabel('Latency (ms)')
@@ -88,23 +97,20 @@ class LatencyPlotter(BasePlotter):
             ax4.grid(True, alpha=0.3)
             
             # Add statistics text box
+            p50, p95, p99 = self.get_latency_quantiles()
             stats_text = f"""Statistics:
-Total Requests: {len(successful_data):,}
-Mean: {successful_data['latency_ms'].mean():.1f} ms
-P50: {successful_data['latency_ms'].quantile(0.5):.1f} ms
-P95: {successful_data['latency_ms'].quantile(0.95):.1f} ms
-P99: {successful_data['latency_ms'].quantile(0.99):.1f} ms
-Std: {successful_data['latency_ms'].std():.1f} ms"""
+Total Requests: {len(latency):,}
+Mean: {latency.mean():.1f} ms
+P50: {p50:.1f} ms
+P95: {p95:.1f} ms
+P99: {p99:.1f} ms
+Std: {latency.std(ddof=1):.1f} ms"""
             
             fig.text(0.02, 0.02, stats_text, fontsize=9, verticalalignment='bottom',
                     bbox=dict(boxstyle="round,pad=0.5", facecolor="lightblue", alpha=0.8))
             
-            plt.tight_layout()
-            
             # Save plot
-            output_file = os.path.join(self.output_dir, 'latency_histogram.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'latency_histogram')
             
             logger.info(f"Created enhanced latency histogram: {output_file}")
             return output_file
@@ -120,46 +126,43 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
             return None
         
         try:
-            successful_data = self.filter_successful_requests()
+            latency, concurrency = self.get_successful_arrays()
             
-            if successful_data is None or len(successful_data) == 0:
+            if latency is None:
                 logger.warning("No successful requests for latency box plot")
                 return None
             
             # Get unique concurrency levels
-            concurrency_levels = sorted(successful_data['concurrency'].unique())
+            concurrency_levels = self.get_concurrency_levels()
             
             # Create single plot
-            plt.figure(figsize=(12, 8))
+            fig = self.new_figure((12, 8))
+            ax = fig.subplots()
             
             if len(concurrency_levels) > 1:
                 # Group data by concurrency for box plot
-                latency_by_concurrency = [successful_data[successful_data['concurrency'] == c]['latency_ms'].values 
-                                        for c in concurrency_levels]
-                box_plot = plt.boxplot(latency_by_concurrency, labels=concurrency_levels, patch_artist=True)
+                latency_by_concurrency = self.get_latency_by_concurrency()
+                box_plot = ax.boxplot(latency_by_concurrency, labels=concurrency_levels, patch_artist=True)
                 
                 # Color boxes differently
-                colors = plt.cm.Set3(range(len(concurrency_levels)))
+                colors = self.palette_colors(self._SET3, len(concurrency_levels))
                 for patch, color in zip(box_plot['boxes'], colors):
                     patch.set_facecolor(color)
                     patch.set_alpha(0.7)
                 
-                plt.title('Latency Distribution by Concurrency Level', fontsize=14)
-                plt.xlabel('Concurrency Level', fontsize=12)
-                plt.ylabel('Latency (ms)', fontsize=12)
+                ax.set_title('Latency Distribution by Concurrency Level', fontsize=14)
+                ax.set_xlabel('Concurrency Level', fontsize=12)
+                ax.set_ylabel('Latency (ms)', fontsize=12)
             else:
                 # Single concurrency level - show simple box plot
-                plt.boxplot(successful_data['latency_ms'])
-                plt.title(f'Latency Distribution (Box Plot)\nConcurrency: {concurrency_levels[0]}', fontsize=14)
-                plt.ylabel('Latency (ms)', fontsize=12)
+                ax.boxplot(latency)
+                ax.set_title(f'Latency Distribution (Box Plot)\nConcurrency: {concurrency_levels[0]}', fontsize=14)
+                ax.set_ylabel('Latency (ms)', fontsize=12)
             
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
+            ax.grid(True, alpha=0.3)
             
             # Save plot
-            output_file = os.path.join(self.output_dir, 'latency_boxplot.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'latency_boxplot')
             
             logger.info(f"Created latency box plot: {output_file}")
             return output_file
@@ -175,41 +178,47 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
             return None
         
         try:
-            successful_data = self.filter_successful_requests()
+            latency, concurrency = self.get_successful_arrays()
             
-            if successful_data is None or len(successful_data) == 0:
+            if latency is None:
                 logger.warning("No successful requests for latency scatter plot")
                 return None
             
             # Get unique concurrency levels
-            concurrency_levels = sorted(successful_data['concurrency'].unique())
+            concurrency_levels = self.get_concurrency_levels()
             
             # Create single plot
-            plt.figure(figsize=(12, 8))
-            
-            # Scatter plot: Latency vs Concurrency
-            plt.scatter(successful_data['concurrency'], successful_data['latency_ms'], 
-                       alpha=0.6, s=20, color='red')
-            
-            plt.title('Latency vs Concurrency', fontsize=14)
-            plt.xlabel('Concurrency Level', fontsize=12)
-            plt.ylabel('Latency (ms)', fontsize=12)
-            plt.grid(True, alpha=0.3)
+            fig = self.new_figure((12, 8))
+            ax = fig.subplots()
+            
+            # Latency vs Concurrency as a 2D histogram: one mesh of cell counts
+            # instead of a marker per request. Concurrency is discrete, so each
+            # level gets its own column centred on it.
+            levels = np.asarray(concurrency_levels, dtype=float)
+            half_gap = np.diff(levels).min() / 2 if len(levels) > 1 else 0.5
+            x_edges = np.concatenate([[levels[0] - half_gap], (levels[:-1] + levels[1:]) / 2,
+                                      [levels[-1] + half_gap]])
+            counts, _, y_edges = np.histogram2d(concurrency, latency, bins=[x_edges, 80])
+            mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts, 0).T,
+                                 cmap='Reds', norm=LogNorm())
+            fig.colorbar(mesh, ax=ax, label='Requests')
+            
+            ax.set_title('Latency vs Concurrency', fontsize=14)
+            ax.set_xlabel('Concurrency Level', fontsize=12)
+            ax.set_ylabel('Latency (ms)', fontsize=12)
+            ax.grid(True, alpha=0.3)
             
             # Add trend line if multiple concurrency levels
             if len(concurrency_levels) > 1:
-                z = np.polyfit(successful_data['concurrency'], successful_data['latency_ms'], 1)
+                z = np.polyfit(concurrency, latency, 1)
                 p = np.poly1d(z)
-                plt.plot(successful_data['concurrency'], p(successful_data['concurrency']), 
+                trend_x = np.linspace(levels[0], levels[-1], 100)
+                ax.plot(trend_x, p(trend_x), 
                         "b--", alpha=0.8, linewidth=2, label=f'Trend: y={z[0]:.1f}x+{z[1]:.1f}')
-                plt.legend()
-            
-            plt.tight_layout()
+                ax.legend()
             
             # Save plot
-            output_file = os.path.join(self.output_dir, 'latency_scatter.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'latency_scatter')
             
             logger.info(f"Created latency scatter plot: {output_file}")
             return output_file
@@ -225,57 +234,61 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
             return None
         
         try:
-            successful_data = self.filter_successful_requests()
+            latency, concurrency = self.get_successful_arrays()
             
-            if successful_data is None or len(successful_data) == 0:
+            if latency is None:
                 logger.warning("No successful requests for latency stats table")
                 return None
             
             # Get unique concurrency levels
-            concurrency_levels = sorted(successful_data['concurrency'].unique())
+            concurrency_levels = self.get_concurrency_levels()
             
             # Create statistics table
+            p50, p95, p99 = self.get_latency_quantiles()
             table_data = []
             headers = ['Concurrency', 'Count', 'Mean (ms)', 'P50 (ms)', 'P95 (ms)', 'P99 (ms)', 'Min (ms)', 'Max (ms)']
             
             if len(concurrency_levels) > 1:
-                for c in concurrency_levels:
-                    c_data = successful_data[successful_data['concurrency'] == c]['latency_ms']
+                # One grouped aggregation for every level instead of a pass per level;
+                # percentiles take one np.percentile call per (already split) level
+                level_stats = pd.Series(latency).groupby(concurrency, sort=True).agg(['count', 'mean', 'min', 'max'])
+                level_percentiles = [np.percentile(c_data, [50, 95, 99]) for c_data in self.get_latency_by_concurrency()]
+                for (c, stats), (c_p50, c_p95, c_p99) in zip(level_stats.iterrows(), level_percentiles):
                     row = [
                         str(c),
-                        str(len(c_data)),
-                        f"{c_data.mean():.1f}",
-                        f"{c_data.quantile(0.5):.1f}",
-                        f"{c_data.quantile(0.95):.1f}",
-                        f"{c_data.quantile(0.99):.1f}",
-                        f"{c_data.min():.1f}",
-                        f"{c_data.max():.1f}"
+                        str(int(stats['count'])),
+                        f"{stats['mean']:.1f}",
+                        f"{c_p50:.1f}",
+                        f"{c_p95:.1f}",
+                        f"{c_p99:.1f}",
+                        f"{stats['min']:.1f}",
+                        f"{stats['max']:.1f}"
                     ]
                     table_data.append(row)
                 
                 # Add overall summary row
-                overall_data = successful_data['latency_ms']
+                overall_data = latency
                 summary_row = [
                     'ALL',
                     str(len(overall_data)),
                     f"{overall_data.mean():.1f}",
-                    f"{overall_data.quantile(0.5):.1f}",
-                    f"{overall_data.quantile(0.95):.1f}",
-                    f"{overall_data.quantile(0.99):.1f}",
+                    f"{p50:.1f}",
+                    f"{p95:.1f}",
+                    f"{p99:.1f}",
                     f"{overall_data.min():.1f}",
                     f"{overall_data.max():.1f}"
                 ]
                 table_data.append(summary_row)
             else:
                 # Single concurrency level
-                c_data = successful_data['latency_ms']
+                c_data = latency
                 row = [
                     str(concurrency_levels[0]),
                     str(len(c_data)),
                     f"{c_data.mean():.1f}",
-                    f"{c_data.quantile(0.5):.1f}",
-                    f"{c_data.quantile(0.95):.1f}",
-                    f"{c_data.quantile(0.99):.1f}",
+                    f"{p50:.1f}",
+                    f"{p95:.1f}",
+                    f"{p99:.1f}",
                     f"{c_data.min():.1f}",
                     f"{c_data.max():.1f}"
                 ]
@@ -283,22 +296,24 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
             
             # Create table file
             output_file = os.path.join(self.output_dir, 'latency_stats_table.txt')
+            lines = [
+                "Latency Statistics by Concurrency Level\n",
+                "=" * 50 + "\n\n",
+                # Headers
+                f"{'Concurrency':<12} {'Count':<8} {'Mean':<10} {'P50':<10} {'P95':<10} {'P99':<10} {'Min':<10} {'Max':<10}\n",
+                "-" * 90 + "\n",
+            ]
+            # Data rows
+            lines.extend(
+                f"{row[0]:<12} {row[1]:<8} {row[2]:<10} {row[3]:<10} {row[4]:<10} {row[5]:<10} {row[6]:<10} {row[7]:<10}\n"
+                for row in table_data
+            )
+            lines.append("\n")
+            lines.append(f"Total Requests: {len(latency):,}\n")
+            lines.append(f"Success Rate: {len(latency) / len(self.data) * 100:.2f}%\n")
+            lines.append(f"Concurrency Levels: {concurrency_levels}\n")
             with open(output_file, 'w') as f:
-                f.write("Latency Statistics by Concurrency Level\n")
-                f.write("=" * 50 + "\n\n")
-                
-                # Write headers
-                f.write(f"{'Concurrency':<12} {'Count':<8} {'Mean':<10} {'P50':<10} {'P95':<10} {'P99':<10} {'Min':<10} {'Max':<10}\n")
-                f.write("-" * 90 + "\n")
-                
-                # Write data rows
-                for row in table_data:
-                    f.write(f"{row[0]:<12} {row[1]:<8} {row[2]:<10} {row[3]:<10} {row[4]:<10} {row[5]:<10} {row[6]:<10} {row[7]:<10}\n")
-                
-                f.write("\n")
-                f.write(f"Total Requests: {len(successful_data):,}\n")
-                f.write(f"Success Rate: {len(successful_data) / len(self.data) * 100:.2f}%\n")
-                f.write(f"Concurrency Levels: {concurrency_levels}\n")
+                f.write("".join(lines))
             
             logger.info(f"Created latency stats table: {output_file}")
             return output_file
@@ -320,43 +335,44 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
                 logger.warning("No successful requests for latency over time plot")
                 return None
             
-            # Convert timestamp to datetime using start_ts (when request actually started)
-            successful_data = successful_data.copy()
-            successful_data['datetime'] = pd.to_datetime(successful_data['start_ts'], unit='s')
+            # Plot straight from column arrays; no copy of the filtered frame.
+            # Datetimes use start_ts (when the request actually started)
+            start_ts = successful_data['start_ts'].to_numpy()
+            request_times = self.get_request_times()
+            latency, concurrency = self.get_successful_arrays()
             
             # Create subplot layout
-            fig, axes = plt.subplots(2, 1, figsize=(15, 10))
+            fig = self.new_figure((15, 10))
+            axes = fig.subplots(2, 1)
             fig.suptitle('Latency Analysis Over Time', fontsize=16, fontweight='bold')
             
             # 1. Latency scatter plot over time
             ax1 = axes[0]
-            scatter = ax1.scatter(successful_data['datetime'], successful_data['latency_ms'], 
-                                c=successful_data['concurrency'], cmap='viridis', alpha=0.6, s=20)
+            scatter = ax1.scatter(request_times, latency, 
+                                c=concurrency, cmap='viridis', alpha=0.6, s=20)
+            # One raster block instead of a vector primitive per request
+            scatter.set_rasterized(True)
             ax1.set_title('Latency Over Time (colored by concurrency)', fontsize=12)
             ax1.set_xlabel('Time')
             ax1.set_ylabel('Latency (ms)')
             ax1.grid(True, alpha=0.3)
-            plt.colorbar(scatter, ax=ax1, label='Concurrency Level')
+            fig.colorbar(scatter, ax=ax1, label='Concurrency Level')
             
             # 2. Rolling average latency
             ax2 = axes[1]
-            # Calculate rolling average with 30-second windows
-            successful_data_sorted = successful_data.sort_values('start_ts')
-            successful_data_sorted['rolling_avg_latency'] = successful_data_sorted['latency_ms'].rolling(window=10, min_periods=1).mean()
+            # Rolling average over 10 consecutive requests in start order
+            order = np.argsort(start_ts, kind='stable')
+            rolling_avg_latency = _moving_average(latency[order], window=10)
             
-            ax2.plot(successful_data_sorted['datetime'], successful_data_sorted['rolling_avg_latency'], 
+            ax2.plot(request_times[order], rolling_avg_latency, 
                     linewidth=2, color='red', alpha=0.8)
             ax2.set_title('Rolling Average Latency (10-request window)', fontsize=12)
             ax2.set_xlabel('Time')
             ax2.set_ylabel('Rolling Average Latency (ms)')
             ax2.grid(True, alpha=0.3)
             
-            plt.tight_layout()
-            
             # Save plot
-            output_file = os.path.join(self.output_dir, 'latency_over_time.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'latency_over_time')
             
             logger.info(f"Created latency over time plot: {output_file}")
             return output_file
@@ -372,61 +388,54 @@ Std: {successful_data['latency_ms'].std():.1f} ms"""
             return None
         
         try:
-            successful_data = self.filter_successful_requests()
+            latency, _ = self.get_successful_arrays()
             
-            if successful_data is None or len(successful_data) == 0:
+            if latency is None:
                 logger.warning("No successful requests for violin plot")
                 return None
             
             # Get unique concurrency levels
-            concurrency_levels = sorted(successful_data['concurrency'].unique())
+            concurrency_levels = self.get_concurrency_levels()
             
             if len(concurrency_levels) < 2:
                 logger.warning("Need at least 2 concurrency levels for violin plot")
                 return None
             
-            plt.figure(figsize=(12, 8))
+            fig = self.new_figure((12, 8))
+            ax = fig.subplots()
             
             # Prepare data for violin plot
-            violin_data = []
-            labels = []
-            for concurrency in concurrency_levels:
-                c_data = successful_data[successful_data['concurrency'] == concurrency]['latency_ms']
-                violin_data.append(c_data.values)
-                labels.append(f'Concurrency {concurrency}')
+            violin_data = self.get_latency_by_concurrency()
+            labels = [f'Concurrency {concurrency}' for concurrency in concurrency_levels]
             
             # Create violin plot
-            parts = plt.violinplot(violin_data, positions=range(len(concurrency_levels)), 
+            parts = ax.violinplot(violin_data, positions=range(len(concurrency_levels)), 
                                  showmeans=True, showmedians=True, showextrema=True)
             
             # Customize violin plot
-            colors = plt.cm.Set2(range(len(concurrency_levels)))
+            colors = self.palette_colors(self._SET2, len(concurrency_levels))
             for i, pc in enumerate(parts['bodies']):
                 pc.set_facecolor(colors[i])
                 pc.set_alpha(0.7)
             
-            plt.title('Latency Distribution by Concurrency Level (Violin Plot)', fontsize=14)
-            plt.xlabel('Concurrency Level', fontsize=12)
-            plt.ylabel('Latency (ms)', fontsize=12)
-            plt.xticks(range(len(concurrency_levels)), labels)
-            plt.grid(True, alpha=0.3)
+            ax.set_title('Latency Distribution by Concurrency Level (Violin Plot)', fontsize=14)
+            ax.set_xlabel('Concurrency Level', fontsize=12)
+            ax.set_ylabel('Latency (ms)', fontsize=12)
+            ax.set_xticks(range(len(concurrency_levels)), labels)
+            ax.grid(True, alpha=0.3)
             
             # Add statistics text
             stats_text = f"""Statistics:
 Total Concurrency Levels: {len(concurrency_levels)}
-Total Requests: {len(successful_data):,}
-Mean Latency: {successful_data['latency_ms'].mean():.1f} ms"""
+Total Requests: {len(latency):,}
+Mean Latency: {latency.mean():.1f} ms"""
             
-            plt.text(0.02, 0.98, stats_text, transform=plt.gca().transAxes, 
+            ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, 
                     fontsize=10, verticalalignment='top',
                     bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8))
             
-            plt.tight_layout()
-            
             # Save plot
-            output_file = os.path.join(self.output_dir, 'latency_violin_plot.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'latency_violin_plot')
             
             logger.info(f"Created violin plot: {output_file}")
             return output_file
@@ -442,12 +451,16 @@ Mean Latency: {successful_data['latency_ms'].mean():.1f} ms"""
             return None
 
         try:
-            df = ensure_retry_count_column(self.data.copy())
+            df = ensure_retry_count_column(self.data)
             stats = compute_retry_error_statistics(df)
-            df["_status_label"] = df["http_status"].apply(http_status_display_label)
-            status_counts = df["_status_label"].value_counts().sort_index()
+            # Count per status code first and label only the few distinct codes,
+            # instead of copying the frame to add a per-row label column
+            status_counts = df["http_status"].value_counts()
+            status_counts.index = status_counts.index.map(http_status_display_label)
+            status_counts = status_counts.sort_index()
 
-            fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+            fig = self.new_figure((14, 6))
+            axes = fig.subplots(1, 2)
             fig.suptitle("Errors, HTTP status, and retries", fontsize=14, fontweight="bold")
 
             ax1 = axes[0]
@@ -482,10 +495,7 @@ Mean Latency: {successful_data['latency_ms'].mean():.1f} ms"""
             ax2.set_ylabel("Count")
             ax2.grid(True, axis="y", alpha=0.3)
 
-            plt.tight_layout()
-            output_file = os.path.join(self.output_dir, "error_analysis.png")
-            plt.savefig(output_file, dpi=300, bbox_inches="tight")
-            plt.close()
+            output_file = self.save_figure(fig, 'error_analysis')
 
             report_file = os.path.join(self.output_dir, "error_retry_report.txt")
             with open(report_file, "w") as f:
@@ -3,7 +3,6 @@ Throughput visualization plots.
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import logging
 import os
@@ -11,8 +10,8 @@ import os
 from .base import BasePlotter
 from common.metrics_utils import (
     prorate_bytes_to_time_windows,
-    calculate_phase_throughput_with_prorating,
-    get_phase_boundaries,
+    build_window_starts,
+    calculate_all_phase_throughputs,
     calculate_throughput_gbps,
     calculate_latency_stats,
     bytes_to_gb,
@@ -33,7 +32,8 @@ class ThroughputPlotter(BasePlotter):
             return None
         
         try:
-            plt.figure(figsize=(15, 8))
+            fig = self.new_figure((15, 8))
+            ax = fig.subplots()
             
             # Use start_ts/end_ts for time range
             start_time = self.data['start_ts'].min()
@@ -41,11 +41,7 @@ class ThroughputPlotter(BasePlotter):
             
             # Generate windows using configured window size
             window_size = THROUGHPUT_WINDOW_SIZE_SECONDS
-            window_start_times = []
-            current_time = start_time
-            while current_time <= end_time:
-                window_start_times.append(current_time)
-                current_time += window_size
+            window_start_times = build_window_starts(start_time, end_time, window_size)
             
             # Use prorating utility for 30-second windows
             throughput_data = prorate_bytes_to_time_windows(
@@ -53,37 +49,27 @@ class ThroughputPlotter(BasePlotter):
                 window_start_times,
                 window_size_seconds=window_size,
                 start_col='start_ts',
-                end_col='end_ts'
+                end_col='end_ts',
+                phase_boundaries=self.get_phase_boundaries(),
+                overlap_index=self.get_overlap_index(),
             )
             
             if throughput_data is None or len(throughput_data) == 0:
                 logger.warning("No throughput data generated")
                 return None
             
-            # Get unique phases for coloring
-            phase_color_map = self.get_phase_colors()
-            
             # Plot throughput over time with phase colors
-            phases = self.get_unique_phases()
-            for phase in phases:
-                phase_data = throughput_data[throughput_data['phase_id'] == phase]
-                if len(phase_data) > 0:
-                    plt.plot(phase_data['window_start'], phase_data['throughput_gbps'], 
-                            marker='o', linewidth=2, markersize=4, 
-                            color=phase_color_map[phase], label=f'Phase: {phase}')
-            
-            plt.title('Throughput Timeline by Phase (30s windows, prorated)', fontsize=14)
-            plt.xlabel('Time', fontsize=12)
-            plt.ylabel('Throughput (Gbps)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.legend()
-            plt.tight_layout()
+            self.plot_phase_lines(ax, throughput_data['window_start'], throughput_data['throughput_gbps'],
+                                  throughput_data['phase_id'], marker='o', linewidth=2, markersize=4)
+            
+            ax.set_title('Throughput Timeline by Phase (30s windows, prorated)', fontsize=14)
+            ax.set_xlabel('Time', fontsize=12)
+            ax.set_ylabel('Throughput (Gbps)', fontsize=12)
+            ax.grid(True, alpha=0.3)
+            ax.tick_params(axis='x', labelrotation=45)
             
             # Save plot
-            output_file = os.path.join(self.output_dir, 'throughput_timeline.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'throughput_timeline')
             
             logger.info(f"Created throughput timeline plot: {output_file}")
             return output_file
@@ -99,7 +85,8 @@ class ThroughputPlotter(BasePlotter):
             return None
         
         try:
-            plt.figure(figsize=(15, 8))
+            fig = self.new_figure((15, 8))
+            ax = fig.subplots()
             
             # Use sweep line algorithm for per-second throughput calculation
             per_second_data = self._calculate_per_second_throughput_sweep_line()
@@ -108,30 +95,18 @@ class ThroughputPlotter(BasePlotter):
                 logger.warning("No per-second data generated")
                 return None
             
-            # Get unique phases for coloring
-            phase_color_map = self.get_phase_colors()
-            
             # Plot per-second throughput over time with phase colors
-            phases = self.get_unique_phases()
-            for phase in phases:
-                phase_data = per_second_data[per_second_data['phase_id'] == phase]
-                if len(phase_data) > 0:
-                    plt.plot(phase_data['second'], phase_data['throughput_gbps'], 
-                            marker='.', linewidth=1, markersize=2, 
-                            color=phase_color_map[phase], label=f'Phase: {phase}', alpha=0.7)
-            
-            plt.title('Per-Second Throughput Timeline by Phase', fontsize=14)
-            plt.xlabel('Time', fontsize=12)
-            plt.ylabel('Throughput (Gbps)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.legend()
-            plt.tight_layout()
+            self.plot_phase_lines(ax, per_second_data['second'], per_second_data['throughput_gbps'],
+                                  per_second_data['phase_id'], marker='.', linewidth=1, markersize=2, alpha=0.7)
+            
+            ax.set_title('Per-Second Throughput Timeline by Phase', fontsize=14)
+            ax.set_xlabel('Time', fontsize=12)
+            ax.set_ylabel('Throughput (Gbps)', fontsize=12)
+            ax.grid(True, alpha=0.3)
+            ax.tick_params(axis='x', labelrotation=45)
             
             # Save plot
-            output_file = os.path.join(self.output_dir, 'per_second_throughput_timeline.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'per_second_throughput_timeline')
             
             logger.info(f"Created per-second throughput timeline plot: {output_file}")
             return output_file
@@ -143,9 +118,9 @@ class ThroughputPlotter(BasePlotter):
     def _calculate_per_second_throughput_sweep_line(self):
         """Calculate per-second throughput using sweep line algorithm with start_ts/end_ts.
         
-        The sweep line algorithm processes requests chronologically and maintains
-        a sliding window of requests that contribute to each second's throughput.
-        Uses start_ts/end_ts for accurate timing and prorates bytes across seconds.
+        Request start/end events are sorted once and integrated with prefix
+        sums (see prorate_bytes_to_time_windows), so bytes are prorated across
+        seconds in O((N + S) log N) instead of scanning all requests per second.
         """
         if len(self.data) == 0:
             return None
@@ -155,11 +130,7 @@ class ThroughputPlotter(BasePlotter):
         end_time = self.data['end_ts'].max()
         
         # Generate all seconds in the range
-        seconds = []
-        current_time = int(start_time)
-        while current_time <= int(end_time) + 1:
-            seconds.append(float(current_time))
-            current_time += 1
+        seconds = build_window_starts(int(start_time), int(end_time) + 1, PER_SECOND_WINDOW_SIZE_SECONDS)
         
         # Use shared prorating utility
         per_second_data = prorate_bytes_to_time_windows(
@@ -167,7 +138,9 @@ class ThroughputPlotter(BasePlotter):
             seconds,
             window_size_seconds=PER_SECOND_WINDOW_SIZE_SECONDS,
             start_col='start_ts',
-            end_col='end_ts'
+            end_col='end_ts',
+            phase_boundaries=self.get_phase_boundaries(),
+            overlap_index=self.get_overlap_index()
         )
         
         if per_second_data is None or len(per_second_data) == 0:
@@ -195,14 +168,15 @@ class ThroughputPlotter(BasePlotter):
                 return None
             
             # Group by concurrency and calculate metrics using start_ts/end_ts
-            concurrency_stats = successful_data.groupby('concurrency').agg({
-                'bytes': 'sum',
-                'latency_ms': ['mean', 'std', 'count'],
-                'start_ts': 'min',
-                'end_ts': 'max'
-            }).reset_index()
-            concurrency_stats.columns = ['concurrency', 'total_bytes', 'avg_latency', 'latency_std', 
-                                        'request_count', 'start_time', 'end_time']
+            # Named aggregation: flat columns, no MultiIndex to rename afterwards
+            concurrency_stats = successful_data.groupby('concurrency').agg(
+                total_bytes=('bytes', 'sum'),
+                avg_latency=('latency_ms', 'mean'),
+                latency_std=('latency_ms', 'std'),
+                request_count=('latency_ms', 'count'),
+                start_time=('start_ts', 'min'),
+                end_time=('end_ts', 'max'),
+            ).reset_index()
             
             # Calculate throughput for each concurrency level in gigabits per second (Gbps)
             concurrency_stats['duration_seconds'] = concurrency_stats['end_time'] - concurrency_stats['start_time']
@@ -212,7 +186,8 @@ class ThroughputPlotter(BasePlotter):
             concurrency_stats['requests_per_second'] = concurrency_stats['request_count'] / concurrency_stats['duration_seconds']
             
             # Create subplot layout
-            fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+            fig = self.new_figure((16, 12))
+            axes = fig.subplots(2, 2)
             fig.suptitle('Throughput vs Concurrency Analysis', fontsize=16, fontweight='bold')
             
             # 1. Throughput vs Concurrency
@@ -256,12 +231,8 @@ class ThroughputPlotter(BasePlotter):
             ax4.set_ylabel('Efficiency (Gbps per Connection)')
             ax4.grid(True, alpha=0.3)
             
-            plt.tight_layout()
-            
             # Save plot
-            output_file = os.path.join(self.output_dir, 'throughput_vs_concurrency.png')
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            plt.close()
+            output_file = self.save_figure(fig, 'throughput_vs_concurrency')
             
             logger.info(f"Created throughput vs concurrency plot: {output_file}")
             return output_file
@@ -285,19 +256,19 @@ class ThroughputPlotter(BasePlotter):
             
             # Calculate throughput for each phase using prorating utility
             # First, get phase boundaries from all data
-            phase_boundaries = get_phase_boundaries(successful_data)
+            phase_boundaries = self.get_phase_boundaries(successful_only=True)
+            # Prorated throughput of all phases, considering ALL requests overlapping each phase
+            phase_throughputs = calculate_all_phase_throughputs(successful_data, phase_boundaries)
             
+            # Integer phase codes: one factorization instead of comparing phase
+            # strings for every phase
+            phase_codes, phases = pd.factorize(successful_data['phase_id'])
             phase_stats_list = []
-            for phase_id in successful_data['phase_id'].unique():
-                # Use the new prorating function that considers ALL requests overlapping with the phase
-                phase_result = calculate_phase_throughput_with_prorating(
-                    successful_data,  # Pass all data, not just phase_data
-                    phase_id=phase_id,
-                    phase_boundaries=phase_boundaries
-                )
+            for code, phase_id in enumerate(phases):
+                phase_result = phase_throughputs[phase_id]
                 
                 # Get additional stats from requests that started in this phase
-                phase_data = successful_data[successful_data['phase_id'] == phase_id]
+                phase_data = successful_data[phase_codes == code]
                 phase_result['phase_id'] = phase_id
                 
                 # Use shared utility for latency/RTT stats (consistent with worker_pool)
@@ -387,23 +358,25 @@ class ThroughputPlotter(BasePlotter):
             
             # Create table file
             output_file = os.path.join(self.output_dir, 'throughput_stats_table.txt')
+            lines = [
+                "Throughput Statistics by Phase/Step\n",
+                "=" * 100 + "\n\n",
+                # Headers
+                f"{'Phase':<12} {'Duration':<12} {'Requests':<12} {'Data (GB)':<12} "
+                f"{'Throughput (Gbps)':<20} {'Req/s':<10} {'Latency (ms)':<15} {'RTT (ms)':<12} {'Concurrency':<12}\n",
+                "-" * 112 + "\n",
+            ]
+            # Data rows
+            lines.extend(
+                f"{row[0]:<12} {row[1]:<12} {row[2]:<12} {row[3]:<12} "
+                f"{row[4]:<15} {row[5]:<10} {row[6]:<15} {row[7]:<12} {row[8]:<12}\n"
+                for row in table_data
+            )
+            lines.append("\n")
+            lines.append(f"Total Requests: {len(successful_data):,}\n")
+            lines.append(f"Success Rate: {len(successful_data) / len(self.data) * 100:.2f}%\n")
             with open(output_file, 'w') as f:
-                f.write("Throughput Statistics by Phase/Step\n")
-                f.write("=" * 100 + "\n\n")
-                
-                # Write headers
-                f.write(f"{'Phase':<12} {'Duration':<12} {'Requests':<12} {'Data (GB)':<12} "
-                       f"{'Throughput (Gbps)':<20} {'Req/s':<10} {'Latency (ms)':<15} {'RTT (ms)':<12} {'Concurrency':<12}\n")
-                f.write("-" * 112 + "\n")
-                
-                # Write data rows
-                for row in table_data:
-                    f.write(f"{row[0]:<12} {row[1]:<12} {row[2]:<12} {row[3]:<12} "
-                           f"{row[4]:<15} {row[5]:<10} {row[6]:<15} {row[7]:<12} {row[8]:<12}\n")
-                
-                f.write("\n")
-                f.write(f"Total Requests: {len(successful_data):,}\n")
-                f.write(f"Success Rate: {len(successful_data) / len(self.data) * 100:.2f}%\n")
+                f.write("".join(lines))
             
             logger.info(f"Created throughput stats table: {output_file}")
             return output_file